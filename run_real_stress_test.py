@@ -11,6 +11,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from tests.stress.test_real_stress import (
     StressTestApplication,
+    run_with_fast_loop,
     test_baseline_scenario,
     test_peak_load_scenario,
     test_sustained_load_scenario,
@@ -94,9 +95,9 @@ def main():
         # You can add logic here to reduce test durations
     
     if args.test == "all":
-        asyncio.run(run_all_tests())
+        run_with_fast_loop(run_all_tests())
     else:
-        asyncio.run(run_selected_test(args.test))
+        run_with_fast_loop(run_selected_test(args.test))
 
 
 if __name__ == "__main__":
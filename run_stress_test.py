@@ -16,6 +16,7 @@ from pathlib import Path
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from tests.stress.loop_runner import run_with_fast_loop
 from tests.stress.test_real_stress import StressTestApplication
 
 # Configure logging
@@ -71,7 +72,7 @@ def main():
             sys.exit(1)
     
     # Run the test
-    asyncio.run(run_test(test_type))
+    run_with_fast_loop(run_test(test_type))
 
 
 if __name__ == "__main__":
@@ -22,6 +22,7 @@ from src.core.redis_storage import RetryRedisStorage
 from src.core.settings import get_settings
 from src.handlers import admin_router, callback_router, command_router, edit_router, error_router, message_router
 from src.middleware.auth import AuthMiddleware
+from src.services.todoist_service import close_http_client
 
 # Configure logging
 logging.basicConfig(
@@ -158,6 +159,9 @@ class Application:
         if self.redis:
             await self.redis.close()
 
+        # Close Todoist HTTP client
+        await close_http_client()
+
         # Close database
         await self.database.close()
 
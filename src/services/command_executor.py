@@ -1,9 +1,12 @@
 """Command executor for handling user commands."""
 
 import logging
+from collections.abc import Callable
 from datetime import datetime
 
-from src.core.database import get_database
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import Database, get_database
 from src.core.exceptions import BotError, TodoistError
 from src.models.intent import CommandExecution
 from src.repositories.task import TaskRepository
@@ -15,9 +18,22 @@ logger = logging.getLogger(__name__)
 class CommandExecutor:
     """Executes commands based on parsed intent."""
 
-    def __init__(self) -> None:
-        """Initialize command executor."""
-        self.db = get_database()
+    def __init__(
+        self,
+        todoist_factory: Callable[[str], TodoistService] = TodoistService,
+        db_getter: Callable[[], Database] = get_database,
+        task_repo_cls: Callable[[AsyncSession], TaskRepository] = TaskRepository,
+    ) -> None:
+        """Initialize command executor.
+
+        Args:
+            todoist_factory: Builds a Todoist client from an API token
+            db_getter: Returns the database to open sessions on
+            task_repo_cls: Builds a task repository from a session
+        """
+        self.db = db_getter()
+        self._todoist_factory = todoist_factory
+        self._task_repo_cls = task_repo_cls
 
     async def execute(
         self,
@@ -62,7 +78,7 @@ class CommandExecutor:
         todoist_token: str
     ) -> str:
         """View tasks based on filters."""
-        async with TodoistService(todoist_token) as todoist:
+        async with self._todoist_factory(todoist_token) as todoist:
             # Determine filter string based on target
             filter_string = None
             title = "📋 Все задачи"
@@ -210,14 +226,14 @@ class CommandExecutor:
 
         # Get last task from database
         async with self.db.get_session() as session:
-            task_repo = TaskRepository(session)
+            task_repo = self._task_repo_cls(session)
             last_task = await task_repo.get_last_task(user_id)
 
             if not last_task or not last_task.todoist_id:
                 return "❌ Последняя задача не найдена"
 
             # Delete from Todoist
-            async with TodoistService(todoist_token) as todoist:
+            async with self._todoist_factory(todoist_token) as todoist:
                 success = await todoist.delete_task(last_task.todoist_id)
 
                 if success:
@@ -246,7 +262,7 @@ class CommandExecutor:
 
         # Get last task from database
         async with self.db.get_session() as session:
-            task_repo = TaskRepository(session)
+            task_repo = self._task_repo_cls(session)
             last_task = await task_repo.get_last_task(user_id)
 
             if not last_task or not last_task.todoist_id:
@@ -273,7 +289,7 @@ class CommandExecutor:
                 update_descriptions.append(f"текст → {content}")
 
             # Update in Todoist
-            async with TodoistService(todoist_token) as todoist:
+            async with self._todoist_factory(todoist_token) as todoist:
                 updated_task = await todoist.update_task(
                     last_task.todoist_id,
                     **todoist_updates
@@ -297,14 +313,14 @@ class CommandExecutor:
 
         # Get last task from database
         async with self.db.get_session() as session:
-            task_repo = TaskRepository(session)
+            task_repo = self._task_repo_cls(session)
             last_task = await task_repo.get_last_task(user_id)
 
             if not last_task or not last_task.todoist_id:
                 return "❌ Последняя задача не найдена"
 
             # Complete in Todoist
-            async with TodoistService(todoist_token) as todoist:
+            async with self._todoist_factory(todoist_token) as todoist:
                 success = await todoist.complete_task(last_task.todoist_id)
 
                 if success:
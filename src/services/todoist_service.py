@@ -2,7 +2,10 @@
 
 import asyncio
 import logging
+import math
 import random
+import time
+from collections.abc import Callable
 from datetime import datetime, timedelta
 from typing import Any
 
@@ -12,14 +15,45 @@ from src.core.exceptions import InvalidTokenError, QuotaExceededError, RateLimit
 
 logger = logging.getLogger(__name__)
 
+TODOIST_API_URL = "https://api.todoist.com"
+
+# Shared HTTP client, reused by every TodoistService instance
+_http_client: httpx.AsyncClient | None = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Todoist HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            base_url=TODOIST_API_URL,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(10.0, connect=5.0),
+            http2=True,
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared Todoist HTTP client."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 class TodoistService:
     """Service for interacting with Todoist API."""
 
-    BASE_URL = "https://api.todoist.com/rest/v2"
-    SYNC_URL = "https://api.todoist.com/sync/v9"
+    BASE_URL = "/rest/v2"
+    SYNC_URL = "/sync/v9"
     MAX_RETRIES = 3
     INITIAL_RETRY_DELAY = 1.0  # seconds
+    PROJECTS_CACHE_TTL = 30.0  # seconds
 
     def __init__(self, api_token: str) -> None:
         """Initialize Todoist service.
@@ -32,21 +66,23 @@ class TodoistService:
             "Authorization": f"Bearer {api_token}",
             "Content-Type": "application/json",
         }
-        self._client: httpx.AsyncClient | None = None
         self._rate_limiter = RateLimiter(max_requests=450, window_seconds=900)  # 450 req/15 min
-        self._projects_cache: list[dict[str, Any]] | None = None
+        # (fetched_at monotonic timestamp, projects)
+        self._projects_cache: tuple[float, list[dict[str, Any]]] | None = None
+        self._projects_by_name: dict[str, dict[str, Any]] = {}
         self._labels_cache: list[dict[str, Any]] | None = None
         self._cache_expiry: datetime | None = None
 
     async def __aenter__(self) -> "TodoistService":
         """Async context manager entry."""
-        self._client = httpx.AsyncClient(timeout=30.0)
         return self
 
     async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
-        """Async context manager exit."""
-        if self._client:
-            await self._client.aclose()
+        """Async context manager exit.
+
+        The shared HTTP client outlives the service; it is closed on
+        application shutdown via close_http_client().
+        """
 
     async def _make_request_with_retry(
         self,
@@ -69,23 +105,23 @@ class TodoistService:
         """
         for attempt in range(self.MAX_RETRIES):
             try:
-                async with self._get_client() as client:
-                    response = await client.request(method, url, **kwargs)
+                client = self._get_client()
+                response = await client.request(method, url, **kwargs)
                     
-                    # If not 503, return response (caller will handle other status codes)
-                    if response.status_code != 503:
-                        return response
+                # If not 503, return response (caller will handle other status codes)
+                if response.status_code != 503:
+                    return response
                     
-                    # Handle 503 with retry
-                    if attempt < self.MAX_RETRIES - 1:
-                        delay = self.INITIAL_RETRY_DELAY * (2 ** attempt) + random.uniform(0, 0.1)
-                        logger.warning(
-                            f"Todoist API returned 503, retrying in {delay:.2f}s "
-                            f"(attempt {attempt + 1}/{self.MAX_RETRIES})"
-                        )
-                        await asyncio.sleep(delay)
-                    else:
-                        raise TodoistError("Todoist service temporarily unavailable")
+                # Handle 503 with retry
+                if attempt < self.MAX_RETRIES - 1:
+                    delay = self.INITIAL_RETRY_DELAY * (2 ** attempt) + random.uniform(0, 0.1)
+                    logger.warning(
+                        f"Todoist API returned 503, retrying in {delay:.2f}s "
+                        f"(attempt {attempt + 1}/{self.MAX_RETRIES})"
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    raise TodoistError("Todoist service temporarily unavailable")
                         
             except httpx.RequestError as e:
                 if attempt < self.MAX_RETRIES - 1:
@@ -220,22 +256,34 @@ class TodoistService:
     async def get_projects(self) -> list[dict[str, Any]]:
         """Get all projects with caching.
 
+        Projects are cached for PROJECTS_CACHE_TTL seconds. If a refresh fails
+        because Todoist is unreachable, the last known projects are served
+        regardless of their age.
+
         Returns:
             List of project dictionaries
 
         Raises:
             TodoistError: For API errors
         """
-        if self._is_cache_valid():
-            return self._projects_cache or []
+        if self._projects_cache is not None:
+            fetched_at, projects = self._projects_cache
+            if time.monotonic() - fetched_at < self.PROJECTS_CACHE_TTL:
+                return projects
 
         await self._rate_limiter.acquire()
 
-        response = await self._make_request_with_retry(
-            "GET",
-            f"{self.BASE_URL}/projects",
-            headers=self.headers,
-        )
+        try:
+            response = await self._make_request_with_retry(
+                "GET",
+                f"{self.BASE_URL}/projects",
+                headers=self.headers,
+            )
+        except TodoistError as e:
+            if self._projects_cache is None:
+                raise
+            logger.warning(f"Failed to refresh projects, serving stale cache: {e}")
+            return self._projects_cache[1]
 
         if response.status_code == 401:
             raise InvalidTokenError()
@@ -244,9 +292,11 @@ class TodoistService:
         elif response.status_code != 200:
             raise TodoistError(f"Failed to get projects: {response.status_code}")
 
-        self._projects_cache = response.json()
-        self._update_cache_expiry()
-        return self._projects_cache
+        projects = response.json()
+        self._projects_cache = (time.monotonic(), projects)
+        # Reversed so the first project wins on duplicate names, as in a linear scan
+        self._projects_by_name = {p["name"].lower(): p for p in reversed(projects)}
+        return projects
 
     async def get_labels(self) -> list[dict[str, Any]]:
         """Get all labels with caching.
@@ -263,22 +313,22 @@ class TodoistService:
         await self._rate_limiter.acquire()
 
         try:
-            async with self._get_client() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/labels",
-                    headers=self.headers,
-                )
-
-                if response.status_code == 401:
-                    raise InvalidTokenError()
-                elif response.status_code == 403:
-                    raise QuotaExceededError()
-                elif response.status_code != 200:
-                    raise TodoistError(f"Failed to get labels: {response.status_code}")
-
-                self._labels_cache = response.json()
-                self._update_cache_expiry()
-                return self._labels_cache
+            client = self._get_client()
+            response = await client.get(
+                f"{self.BASE_URL}/labels",
+                headers=self.headers,
+            )
+
+            if response.status_code == 401:
+                raise InvalidTokenError()
+            elif response.status_code == 403:
+                raise QuotaExceededError()
+            elif response.status_code != 200:
+                raise TodoistError(f"Failed to get labels: {response.status_code}")
+
+            self._labels_cache = response.json()
+            self._update_cache_expiry()
+            return self._labels_cache
         except httpx.RequestError as e:
             logger.error(f"Network error getting labels: {e}")
             raise TodoistError(f"Network error: {str(e)}")
@@ -292,11 +342,8 @@ class TodoistService:
         Returns:
             Project dictionary or None if not found
         """
-        projects = await self.get_projects()
-        for project in projects:
-            if project["name"].lower() == name.lower():
-                return project
-        return None
+        await self.get_projects()
+        return self._projects_by_name.get(name.lower())
 
     async def update_task(
         self,
@@ -329,23 +376,23 @@ class TodoistService:
             raise TodoistError("No fields to update")
 
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/tasks/{task_id}",
-                    headers=self.headers,
-                    json=update_data,
-                )
-
-                if response.status_code == 401:
-                    raise InvalidTokenError()
-                elif response.status_code == 403:
-                    raise QuotaExceededError()
-                elif response.status_code == 404:
-                    raise TodoistError("Task not found")
-                elif response.status_code != 200:
-                    raise TodoistError(f"Failed to update task: {response.status_code}")
-
-                return response.json()
+            client = self._get_client()
+            response = await client.post(
+                f"{self.BASE_URL}/tasks/{task_id}",
+                headers=self.headers,
+                json=update_data,
+            )
+
+            if response.status_code == 401:
+                raise InvalidTokenError()
+            elif response.status_code == 403:
+                raise QuotaExceededError()
+            elif response.status_code == 404:
+                raise TodoistError("Task not found")
+            elif response.status_code != 200:
+                raise TodoistError(f"Failed to update task: {response.status_code}")
+
+            return response.json()
         except httpx.RequestError as e:
             logger.error(f"Network error updating task: {e}")
             raise TodoistError(f"Network error: {str(e)}")
@@ -366,27 +413,27 @@ class TodoistService:
         await self._rate_limiter.acquire()
 
         try:
-            async with self._get_client() as client:
-                response = await client.delete(
-                    f"{self.BASE_URL}/tasks/{task_id}",
-                    headers=self.headers,
-                )
-
-                if response.status_code == 204:  # No content - success
-                    return True
-                elif response.status_code == 404:
-                    logger.warning(f"Task {task_id} not found in Todoist")
-                    return False
-                elif response.status_code == 401:
-                    raise InvalidTokenError()
-                elif response.status_code == 403:
-                    raise QuotaExceededError()
-                elif response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", "60"))
-                    raise RateLimitError(retry_after=retry_after)
-                else:
-                    error_data = response.json() if response.content else {}
-                    raise TodoistError(f"Failed to delete task: {error_data}")
+            client = self._get_client()
+            response = await client.delete(
+                f"{self.BASE_URL}/tasks/{task_id}",
+                headers=self.headers,
+            )
+
+            if response.status_code == 204:  # No content - success
+                return True
+            elif response.status_code == 404:
+                logger.warning(f"Task {task_id} not found in Todoist")
+                return False
+            elif response.status_code == 401:
+                raise InvalidTokenError()
+            elif response.status_code == 403:
+                raise QuotaExceededError()
+            elif response.status_code == 429:
+                retry_after = int(response.headers.get("Retry-After", "60"))
+                raise RateLimitError(retry_after=retry_after)
+            else:
+                error_data = response.json() if response.content else {}
+                raise TodoistError(f"Failed to delete task: {error_data}")
         except httpx.RequestError as e:
             logger.error(f"Network error deleting task: {e}")
             raise TodoistError(f"Network error: {str(e)}")
@@ -407,27 +454,27 @@ class TodoistService:
         await self._rate_limiter.acquire()
 
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/tasks/{task_id}/close",
-                    headers=self.headers,
-                )
-
-                if response.status_code == 204:  # No content - success
-                    return True
-                elif response.status_code == 404:
-                    logger.warning(f"Task {task_id} not found in Todoist")
-                    return False
-                elif response.status_code == 401:
-                    raise InvalidTokenError()
-                elif response.status_code == 403:
-                    raise QuotaExceededError()
-                elif response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", "60"))
-                    raise RateLimitError(retry_after=retry_after)
-                else:
-                    error_data = response.json() if response.content else {}
-                    raise TodoistError(f"Failed to complete task: {error_data}")
+            client = self._get_client()
+            response = await client.post(
+                f"{self.BASE_URL}/tasks/{task_id}/close",
+                headers=self.headers,
+            )
+
+            if response.status_code == 204:  # No content - success
+                return True
+            elif response.status_code == 404:
+                logger.warning(f"Task {task_id} not found in Todoist")
+                return False
+            elif response.status_code == 401:
+                raise InvalidTokenError()
+            elif response.status_code == 403:
+                raise QuotaExceededError()
+            elif response.status_code == 429:
+                retry_after = int(response.headers.get("Retry-After", "60"))
+                raise RateLimitError(retry_after=retry_after)
+            else:
+                error_data = response.json() if response.content else {}
+                raise TodoistError(f"Failed to complete task: {error_data}")
         except httpx.RequestError as e:
             logger.error(f"Network error completing task: {e}")
             raise TodoistError(f"Network error: {str(e)}")
@@ -460,36 +507,36 @@ class TodoistService:
             params["project_id"] = project_id
 
         try:
-            async with self._get_client() as client:
-                # Get all tasks (up to 300 by default in Todoist API)
-                response = await client.get(
-                    f"{self.BASE_URL}/tasks",
-                    headers=self.headers,
-                    params=params,
-                )
-
-                if response.status_code == 401:
-                    raise InvalidTokenError()
-                elif response.status_code == 403:
-                    raise QuotaExceededError()
-                elif response.status_code != 200:
-                    raise TodoistError(f"Failed to get tasks: {response.status_code}")
-
-                tasks = response.json()
-
-                # Apply client-side filtering if needed
-                if filter_string and filter_string not in ["today", "tomorrow", "overdue"]:
-                    # For filters like "p1", "p2", etc., we need to filter manually
-                    if filter_string.startswith("p"):
-                        try:
-                            priority = int(filter_string[1])
-                            tasks = [t for t in tasks if t.get("priority", 1) == priority]
-                        except (ValueError, IndexError):
-                            pass
-
-                # Sort by created date (newest first) and limit
-                tasks.sort(key=lambda x: x.get("created_at", ""), reverse=True)
-                return tasks[:limit]
+            client = self._get_client()
+            # Get all tasks (up to 300 by default in Todoist API)
+            response = await client.get(
+                f"{self.BASE_URL}/tasks",
+                headers=self.headers,
+                params=params,
+            )
+
+            if response.status_code == 401:
+                raise InvalidTokenError()
+            elif response.status_code == 403:
+                raise QuotaExceededError()
+            elif response.status_code != 200:
+                raise TodoistError(f"Failed to get tasks: {response.status_code}")
+
+            tasks = response.json()
+
+            # Apply client-side filtering if needed
+            if filter_string and filter_string not in ["today", "tomorrow", "overdue"]:
+                # For filters like "p1", "p2", etc., we need to filter manually
+                if filter_string.startswith("p"):
+                    try:
+                        priority = int(filter_string[1])
+                        tasks = [t for t in tasks if t.get("priority", 1) == priority]
+                    except (ValueError, IndexError):
+                        pass
+
+            # Sort by created date (newest first) and limit
+            tasks.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            return tasks[:limit]
 
         except httpx.RequestError as e:
             logger.error(f"Network error getting tasks: {e}")
@@ -526,38 +573,34 @@ class TodoistService:
         await self._rate_limiter.acquire()
 
         try:
-            async with self._get_client() as client:
-                response = await client.post(
-                    f"{self.BASE_URL}/tasks/{task_id}/reopen",
-                    headers=self.headers,
-                )
-
-                if response.status_code == 204:  # No content - success
-                    return True
-                elif response.status_code == 404:
-                    logger.warning(f"Task {task_id} not found in Todoist")
-                    return False
-                elif response.status_code == 401:
-                    raise InvalidTokenError()
-                elif response.status_code == 403:
-                    raise QuotaExceededError()
-                elif response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", "60"))
-                    raise RateLimitError(retry_after=retry_after)
-                else:
-                    error_data = response.json() if response.content else {}
-                    raise TodoistError(f"Failed to reopen task: {error_data}")
+            client = self._get_client()
+            response = await client.post(
+                f"{self.BASE_URL}/tasks/{task_id}/reopen",
+                headers=self.headers,
+            )
+
+            if response.status_code == 204:  # No content - success
+                return True
+            elif response.status_code == 404:
+                logger.warning(f"Task {task_id} not found in Todoist")
+                return False
+            elif response.status_code == 401:
+                raise InvalidTokenError()
+            elif response.status_code == 403:
+                raise QuotaExceededError()
+            elif response.status_code == 429:
+                retry_after = int(response.headers.get("Retry-After", "60"))
+                raise RateLimitError(retry_after=retry_after)
+            else:
+                error_data = response.json() if response.content else {}
+                raise TodoistError(f"Failed to reopen task: {error_data}")
         except httpx.RequestError as e:
             logger.error(f"Network error reopening task: {e}")
             raise TodoistError(f"Network error: {str(e)}")
 
     def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client.
-        
-        Note: This returns a new client instance each time to be used as a context manager.
-        The instance client (self._client) is only used when the service itself is used as a context manager.
-        """
-        return httpx.AsyncClient(timeout=30.0)
+        """Get the shared HTTP client."""
+        return get_http_client()
 
     def _is_cache_valid(self) -> bool:
         """Check if cache is still valid."""
@@ -572,6 +615,7 @@ class TodoistService:
     def invalidate_cache(self) -> None:
         """Invalidate the cache."""
         self._projects_cache = None
+        self._projects_by_name = {}
         self._labels_cache = None
         self._cache_expiry = None
 
@@ -579,35 +623,54 @@ class TodoistService:
 class RateLimiter:
     """Token bucket rate limiter for Todoist API."""
 
-    def __init__(self, max_requests: int, window_seconds: int) -> None:
+    def __init__(
+        self,
+        max_requests: int,
+        window_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
         """Initialize rate limiter.
 
+        The bucket holds up to max_requests tokens and refills continuously
+        at max_requests / window_seconds tokens per second.
+
         Args:
             max_requests: Maximum requests allowed
             window_seconds: Time window in seconds
+            clock: Monotonic time source in seconds
         """
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: list[datetime] = []
+        self._clock = clock
+        self._rate = max_requests / window_seconds
+        self._tokens = float(max_requests)
+        self._last_refill = clock()
         self._lock = asyncio.Lock()
 
-    async def acquire(self) -> None:
+    async def acquire(self, wait: bool = False) -> None:
         """Acquire permission to make a request.
 
+        Args:
+            wait: Sleep until a token is available instead of raising.
+                The lock is released while sleeping so other callers are not
+                serialized behind the sleeper.
+
         Raises:
-            RateLimitError: If rate limit would be exceeded
+            RateLimitError: If rate limit would be exceeded and wait is False
         """
-        async with self._lock:
-            now = datetime.now()
-            cutoff = now - timedelta(seconds=self.window_seconds)
-
-            # Remove old requests outside the window
-            self.requests = [req_time for req_time in self.requests if req_time > cutoff]
-
-            if len(self.requests) >= self.max_requests:
-                # Calculate when the oldest request will expire
-                oldest = min(self.requests)
-                wait_time = int((oldest + timedelta(seconds=self.window_seconds) - now).total_seconds())
-                raise RateLimitError(retry_after=wait_time)
-
-            self.requests.append(now)
+        while True:
+            async with self._lock:
+                now = self._clock()
+                self._tokens = min(self.max_requests, self._tokens + (now - self._last_refill) * self._rate)
+                self._last_refill = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                # Time until one full token is available
+                wait_time = (1 - self._tokens) / self._rate
+                if not wait:
+                    raise RateLimitError(retry_after=math.ceil(wait_time))
+
+            await asyncio.sleep(wait_time)
@@ -2,13 +2,59 @@
 
 import asyncio
 import os
-from typing import AsyncGenerator, Generator
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Generator
 
+import httpx
 import pytest
 import pytest_asyncio
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, create_autospec, patch
 
 from src.core.settings import Settings, override_settings
+from src.services.command_executor import CommandExecutor
+
+# Built once at import: autospec introspects the whole httpx.AsyncClient class
+_HTTPX_CLIENT_SPEC = create_autospec(httpx.AsyncClient)
+
+
+@dataclass
+class _FakeSession:
+    """Async context manager standing in for a database session."""
+
+    async def __aenter__(self) -> "_FakeSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+@dataclass
+class _FakeDB:
+    """Database stand-in whose get_session() hands back one shared session."""
+
+    session: _FakeSession = field(default_factory=_FakeSession)
+
+    def get_session(self) -> _FakeSession:
+        return self.session
+
+
+@dataclass
+class _FakeTodoistContext:
+    """Replaces TodoistService(token); entering it yields the service mock."""
+
+    service: AsyncMock
+
+    def __call__(self, *args: Any, **kwargs: Any) -> "_FakeTodoistContext":
+        return self
+
+    async def __aenter__(self) -> AsyncMock:
+        return self.service
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_FAKE_DB = _FakeDB()
 
 
 @pytest.fixture(scope="session")
@@ -63,4 +109,42 @@ async def mock_redis():
     redis.ping.return_value.set_result(True)
     redis.close = Mock(return_value=asyncio.Future())
     redis.close.return_value.set_result(None)
-    return redis
\ No newline at end of file
+    return redis
+
+
+@pytest.fixture
+def httpx_client_cls(monkeypatch):
+    """Replace httpx.AsyncClient with a shared autospec mock.
+
+    Side effects and the entered client from the previous test are cleared
+    too. The autospecced client instance is kept, because resetting its
+    return values would also drop __aexit__'s falsy default and swallow
+    exceptions.
+    """
+    _HTTPX_CLIENT_SPEC.reset_mock(side_effect=True)
+    # Drops the entered client, along with any post/get mocks a test attached
+    _HTTPX_CLIENT_SPEC.return_value.__aenter__.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(httpx, "AsyncClient", _HTTPX_CLIENT_SPEC)
+    return _HTTPX_CLIENT_SPEC
+
+
+@pytest.fixture(scope="session")
+def mock_todoist_service():
+    """Mock Todoist client shared by the session; tests reset it after use."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="session")
+def mock_task_repo():
+    """Mock TaskRepository shared by the session; tests reset it after use."""
+    return AsyncMock()
+
+
+@pytest.fixture(scope="session")
+def command_executor(mock_todoist_service, mock_task_repo):
+    """Create one CommandExecutor wired to the mocks and the fake database."""
+    return CommandExecutor(
+        todoist_factory=_FakeTodoistContext(mock_todoist_service),
+        db_getter=lambda: _FAKE_DB,
+        task_repo_cls=lambda session: mock_task_repo,
+    )
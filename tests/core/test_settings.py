@@ -7,6 +7,7 @@ import pytest
 from pydantic import ValidationError
 from pydantic_settings import SettingsConfigDict
 
+from src.core import settings as settings_module
 from src.core.settings import Settings, get_settings, override_settings
 
 
@@ -38,31 +39,29 @@ class TestSettings:
         assert settings.debug is False
         assert settings.log_level == "INFO"
     
-    def test_settings_validation_error(self):
+    def test_settings_validation_error(self, monkeypatch):
         """Test validation error when required fields are missing."""
-        # Need to temporarily rename .env file to prevent it from being loaded
-        import tempfile
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.dict(os.environ, {"ENV_FILE": f"{temp_dir}/.env"}, clear=True):
-                # Override the model_config to use a non-existent .env file
-                with patch.object(Settings, 'model_config', SettingsConfigDict(
-                    env_file=f"{temp_dir}/.env",
-                    env_file_encoding="utf-8",
-                    case_sensitive=False,
-                    extra="ignore"
-                )):
-                    with pytest.raises(ValidationError) as exc_info:
-                        Settings()
-                    
-                    errors = exc_info.value.errors()
-                    required_fields = {error["loc"][0] for error in errors}
-                    
-                    assert "telegram_bot_token" in required_fields
-                    assert "openai_api_key" in required_fields
-                    assert "deepgram_api_key" in required_fields
-                    assert "database_url" in required_fields
-                    assert "encryption_key" in required_fields
-                    assert "session_secret" in required_fields
+        for key in list(os.environ):
+            monkeypatch.delenv(key, raising=False)
+        # Disable .env loading so a local .env file can't satisfy required fields
+        monkeypatch.setattr(Settings, "model_config", SettingsConfigDict(
+            env_file=None,
+            case_sensitive=False,
+            extra="ignore"
+        ))
+        
+        with pytest.raises(ValidationError) as exc_info:
+            Settings()
+        
+        errors = exc_info.value.errors()
+        required_fields = {error["loc"][0] for error in errors}
+        
+        assert "telegram_bot_token" in required_fields
+        assert "openai_api_key" in required_fields
+        assert "deepgram_api_key" in required_fields
+        assert "database_url" in required_fields
+        assert "encryption_key" in required_fields
+        assert "session_secret" in required_fields
     
     def test_settings_properties(self, test_settings):
         """Test settings property methods."""
@@ -72,22 +71,21 @@ class TestSettings:
         # Todoist tokens are now stored per-user in database, not in settings
         assert test_settings.encryption_secret == "test_encryption_key_32_bytes_long"
     
-    def test_todoist_token_removed(self, mock_env_vars):
+    def test_todoist_token_removed(self, mock_env_vars, monkeypatch):
         """Test that Todoist tokens are no longer in settings."""
         # Remove TODOIST_PERSONAL_TOKEN from env if present
-        env_without_token = {k: v for k, v in mock_env_vars.items() if k != "TODOIST_PERSONAL_TOKEN"}
-        with patch.dict(os.environ, env_without_token, clear=True):
-            settings = Settings()
-            
-            # Todoist configuration should only have API endpoint and rate limit settings
-            assert hasattr(settings, 'todoist_api_endpoint')
-            assert hasattr(settings, 'todoist_rate_limit_requests')
-            assert hasattr(settings, 'todoist_sync_commands_limit')
-            
-            # No personal token or OAuth fields should exist
-            assert not hasattr(settings, 'todoist_personal_token')
-            assert not hasattr(settings, 'todoist_client_id')
-            assert not hasattr(settings, 'todoist_client_secret')
+        monkeypatch.delenv("TODOIST_PERSONAL_TOKEN", raising=False)
+        settings = Settings()
+        
+        # Todoist configuration should only have API endpoint and rate limit settings
+        assert hasattr(settings, 'todoist_api_endpoint')
+        assert hasattr(settings, 'todoist_rate_limit_requests')
+        assert hasattr(settings, 'todoist_sync_commands_limit')
+        
+        # No personal token or OAuth fields should exist
+        assert not hasattr(settings, 'todoist_personal_token')
+        assert not hasattr(settings, 'todoist_client_id')
+        assert not hasattr(settings, 'todoist_client_secret')
     
     def test_settings_model_dump_safe(self, test_settings):
         """Test safe model dump masks secrets."""
@@ -104,12 +102,16 @@ class TestSettings:
         assert safe_dump["server_host"] == "0.0.0.0"
         assert safe_dump["server_port"] == 8443
     
-    def test_get_settings_singleton(self, mock_env_vars):
-        """Test get_settings returns singleton instance."""
-        settings1 = get_settings()
-        settings2 = get_settings()
+    def test_get_settings_singleton(self, mock_env_vars, monkeypatch):
+        """Test get_settings builds Settings once and returns singleton instance."""
+        monkeypatch.setattr(settings_module, "_settings", None)
+        
+        with patch.object(settings_module, "Settings", wraps=Settings) as settings_cls:
+            settings1 = get_settings()
+            settings2 = get_settings()
         
         assert settings1 is settings2
+        settings_cls.assert_called_once()
     
     def test_override_settings(self):
         """Test override_settings for testing."""
@@ -126,6 +128,17 @@ class TestSettings:
         assert settings.telegram_token == test_token
         assert get_settings() is settings
     
+    def test_override_settings_reads_current_env(self, test_settings, monkeypatch):
+        """Test override_settings picks up environment changes made after settings loaded."""
+        monkeypatch.setenv("OPENAI_API_KEY", "rotated_openai_key")
+        settings = override_settings(telegram_bot_token="override_token", debug=True)
+        
+        assert settings is not test_settings
+        assert settings.telegram_token == "override_token"
+        assert settings.debug is True
+        assert settings.openai_key == "rotated_openai_key"
+        assert get_settings() is settings
+    
     def test_todoist_sync_settings(self, test_settings):
         """Test Todoist sync-specific settings."""
         assert test_settings.todoist_api_endpoint == "https://api.todoist.com/api/v1/sync"
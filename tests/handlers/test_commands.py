@@ -8,6 +8,12 @@ from aiogram.types import Message, User
 from src.handlers.commands import cmd_start, cmd_help, cmd_setup, cmd_status, SetupStates
 
 
+def _answer_call(message):
+    """Assert message.answer was called once and return that call."""
+    message.answer.assert_called_once()
+    return message.answer.call_args
+
+
 class TestCommandHandlers:
     """Test command handlers."""
 
@@ -34,7 +40,7 @@ class TestCommandHandlers:
         state.clear = AsyncMock()
         return state
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_cmd_start(self, mock_message):
         """Test /start command."""
         with patch('src.handlers.commands.get_database') as mock_db:
@@ -56,23 +62,21 @@ class TestCommandHandlers:
                 )
                 
                 # Check welcome message
-                mock_message.answer.assert_called_once()
-                args = mock_message.answer.call_args[0]
-                assert "Привет" in args[0]
-                assert "/setup" in args[0]
+                call = _answer_call(mock_message)
+                assert "Привет" in call.args[0]
+                assert "/setup" in call.args[0]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_cmd_help(self, mock_message):
         """Test /help command."""
         await cmd_help(mock_message)
         
         # Check help message
-        mock_message.answer.assert_called_once()
-        args = mock_message.answer.call_args
-        assert "Как использовать бота" in args[0][0]
-        assert args[1]["parse_mode"] == "Markdown"
+        call = _answer_call(mock_message)
+        assert "Как использовать бота" in call.args[0]
+        assert call.kwargs["parse_mode"] == "Markdown"
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_cmd_setup(self, mock_message, mock_state):
         """Test /setup command."""
         await cmd_setup(mock_message, mock_state)
@@ -81,14 +85,13 @@ class TestCommandHandlers:
         mock_state.set_state.assert_called_once_with(SetupStates.waiting_for_token)
         
         # Check instructions message
-        mock_message.answer.assert_called_once()
-        args = mock_message.answer.call_args
-        assert "Настройка подключения" in args[0][0]
-        assert "Todoist Settings" in args[0][0]
-        assert args[1]["parse_mode"] == "Markdown"
-        assert args[1]["disable_web_page_preview"] is True
+        call = _answer_call(mock_message)
+        assert "Настройка подключения" in call.args[0]
+        assert "Todoist Settings" in call.args[0]
+        assert call.kwargs["parse_mode"] == "Markdown"
+        assert call.kwargs["disable_web_page_preview"] is True
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_cmd_status_no_token(self, mock_message):
         """Test /status command without token."""
         with patch('src.handlers.commands.get_database') as mock_db:
@@ -104,12 +107,11 @@ class TestCommandHandlers:
                 await cmd_status(mock_message)
                 
                 # Check error message
-                mock_message.answer.assert_called_once()
-                args = mock_message.answer.call_args[0]
-                assert "Todoist не подключен" in args[0]
-                assert "/setup" in args[0]
+                call = _answer_call(mock_message)
+                assert "Todoist не подключен" in call.args[0]
+                assert "/setup" in call.args[0]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_cmd_status_with_token(self, mock_message):
         """Test /status command with token."""
         from datetime import datetime
@@ -129,8 +131,7 @@ class TestCommandHandlers:
                 await cmd_status(mock_message)
                 
                 # Check status message
-                mock_message.answer.assert_called_once()
-                args = mock_message.answer.call_args[0]
-                assert "Todoist подключен" in args[0]
-                assert "42" in args[0]
-                assert "19.01.2025" in args[0]
\ No newline at end of file
+                call = _answer_call(mock_message)
+                assert "Todoist подключен" in call.args[0]
+                assert "42" in call.args[0]
+                assert "19.01.2025" in call.args[0]
\ No newline at end of file
@@ -5,14 +5,15 @@ import pytest
 from src.services.encryption import EncryptionService
 
 
+@pytest.fixture(scope="module")
+def encryption_service():
+    """Create encryption service instance shared across the module."""
+    return EncryptionService()
+
+
 class TestEncryptionService:
     """Test encryption service."""
 
-    @pytest.fixture
-    def encryption_service(self):
-        """Create encryption service instance."""
-        return EncryptionService()
-
     def test_encrypt_decrypt(self, encryption_service):
         """Test encryption and decryption."""
         original = "test_token_123456789"
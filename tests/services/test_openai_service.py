@@ -20,7 +20,7 @@ class TestOpenAIService:
                 service = OpenAIService()
                 yield service
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_parse_task_success(self, openai_service):
         """Test successful task parsing."""
         # Mock response
@@ -42,7 +42,7 @@ class TestOpenAIService:
         assert result.priority == 2
         assert result.labels == ["покупки"]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_parse_task_with_profanity(self, openai_service):
         """Test task parsing with profanity filtering."""
         mock_task = TaskSchema(content="Купить **** молоко")
@@ -60,13 +60,13 @@ class TestOpenAIService:
         messages = create_call.call_args[1]["messages"]
         assert "*" in messages[1]["content"]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_parse_task_short_message(self, openai_service):
         """Test parsing very short message."""
         with pytest.raises(ValidationError, match="Message is too short"):
             await openai_service.parse_task("Hi")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_parse_task_english(self, openai_service):
         """Test parsing with English language."""
         mock_task = TaskSchema(content="Buy milk")
@@ -82,7 +82,7 @@ class TestOpenAIService:
         messages = create_call.call_args[1]["messages"]
         assert "You are an assistant" in messages[0]["content"]
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_parse_task_openai_error(self, openai_service):
         """Test handling OpenAI API error."""
         openai_service.instructor_client.chat.completions.create = AsyncMock(
@@ -92,7 +92,7 @@ class TestOpenAIService:
         with pytest.raises(OpenAIError, match="Failed to parse task"):
             await openai_service.parse_task("Test message")
 
-    @pytest.mark.asyncio
+    @pytest.mark.asyncio(loop_scope="module")
     async def test_close(self, openai_service):
         """Test closing the service."""
         openai_service.client.close = AsyncMock()
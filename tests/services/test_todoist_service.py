@@ -2,6 +2,7 @@
 
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -9,7 +10,7 @@ import httpx
 import pytest
 
 from src.core.exceptions import InvalidTokenError, QuotaExceededError, RateLimitError, TodoistError
-from src.services.todoist_service import RateLimiter, TodoistService
+from src.services.todoist_service import RateLimiter, TodoistService, close_http_client
 
 
 @pytest.fixture
@@ -21,7 +22,12 @@ def todoist_service():
 @pytest.fixture
 def mock_httpx_client():
     """Create mock httpx client."""
-    client = AsyncMock(spec=httpx.AsyncClient)
+    # No spec: building one from httpx.AsyncClient on every test is slow
+    client = AsyncMock()
+    client.request = AsyncMock()
+    client.get = AsyncMock()
+    client.post = AsyncMock()
+    client.delete = AsyncMock()
     return client
 
 
@@ -38,17 +44,17 @@ class TestTodoistService:
             "full_name": "Test User",
             "id": "123456",
         })
-        mock_httpx_client.get = AsyncMock(return_value=mock_response)
-        mock_httpx_client.__aenter__ = AsyncMock(return_value=mock_httpx_client)
-        mock_httpx_client.__aexit__ = AsyncMock(return_value=None)
+        mock_httpx_client.request = AsyncMock(return_value=mock_response)
 
         with patch.object(todoist_service, "_get_client", return_value=mock_httpx_client):
             result = await todoist_service.validate_token()
 
         assert result["email"] == "test@example.com"
         assert result["full_name"] == "Test User"
-        mock_httpx_client.get.assert_called_once_with(
-            "https://api.todoist.com/sync/v9/user",
+        # URLs are relative to the shared client's base_url
+        mock_httpx_client.request.assert_called_once_with(
+            "GET",
+            "/sync/v9/user",
             headers=todoist_service.headers,
         )
 
@@ -197,6 +203,43 @@ class TestTodoistService:
         # Should only be called once due to caching
         assert mock_httpx_client.get.call_count == 1
 
+    async def test_get_projects_cache_expires(self, todoist_service, mock_httpx_client):
+        """Test projects are refetched once the cache TTL has passed."""
+        stale = time.monotonic() - TodoistService.PROJECTS_CACHE_TTL - 1
+        todoist_service._projects_cache = (stale, [{"id": "1", "name": "Old"}])
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"id": "2", "name": "New"}]
+        mock_httpx_client.request = AsyncMock(return_value=mock_response)
+
+        with patch.object(todoist_service, "_get_client", return_value=mock_httpx_client):
+            with patch.object(todoist_service._rate_limiter, "acquire", new_callable=AsyncMock):
+                result = await todoist_service.get_projects()
+
+        assert result == [{"id": "2", "name": "New"}]
+        mock_httpx_client.request.assert_called_once()
+
+    async def test_get_projects_serves_stale_on_failure(self, todoist_service):
+        """Test expired projects are served when Todoist is unreachable."""
+        stale = time.monotonic() - TodoistService.PROJECTS_CACHE_TTL - 1
+        todoist_service._projects_cache = (stale, [{"id": "1", "name": "Inbox"}])
+        failing_request = AsyncMock(side_effect=TodoistError("Network error"))
+
+        with patch.object(todoist_service, "_make_request_with_retry", failing_request):
+            with patch.object(todoist_service._rate_limiter, "acquire", new_callable=AsyncMock):
+                result = await todoist_service.get_projects()
+
+        assert result == [{"id": "1", "name": "Inbox"}]
+
+    async def test_get_projects_failure_without_cache(self, todoist_service):
+        """Test upstream failures propagate when nothing is cached."""
+        failing_request = AsyncMock(side_effect=TodoistError("Network error"))
+
+        with patch.object(todoist_service, "_make_request_with_retry", failing_request):
+            with patch.object(todoist_service._rate_limiter, "acquire", new_callable=AsyncMock):
+                with pytest.raises(TodoistError):
+                    await todoist_service.get_projects()
+
     async def test_get_project_by_name(self, todoist_service, mock_httpx_client):
         """Test getting project by name."""
         mock_response = AsyncMock()
@@ -234,6 +277,32 @@ class TestTodoistService:
 
         assert result is None
 
+    async def test_get_project_by_name_first_duplicate_wins(self, todoist_service, mock_httpx_client):
+        """Test name lookup keeps the first of several same-named projects."""
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [
+            {"id": "1", "name": "Work"},
+            {"id": "2", "name": "work"},
+        ]
+        mock_httpx_client.request = AsyncMock(return_value=mock_response)
+
+        with patch.object(todoist_service, "_get_client", return_value=mock_httpx_client):
+            with patch.object(todoist_service._rate_limiter, "acquire", new_callable=AsyncMock):
+                result = await todoist_service.get_project_by_name("WORK")
+
+        assert result["id"] == "1"
+
+    async def test_invalidate_cache_clears_project_index(self, todoist_service):
+        """Test invalidating the cache also drops the name index."""
+        todoist_service._projects_cache = (time.monotonic(), [{"id": "1", "name": "Inbox"}])
+        todoist_service._projects_by_name = {"inbox": {"id": "1", "name": "Inbox"}}
+
+        todoist_service.invalidate_cache()
+
+        assert todoist_service._projects_cache is None
+        assert todoist_service._projects_by_name == {}
+
     async def test_network_error_handling(self, todoist_service, mock_httpx_client):
         """Test network error handling."""
         mock_httpx_client.get = AsyncMock(side_effect=httpx.RequestError("Network error"))
@@ -246,6 +315,19 @@ class TestTodoistService:
             
             assert "Network error" in str(exc_info.value)
 
+    async def test_services_share_http_client(self):
+        """Test all service instances reuse one pooled HTTP client."""
+        first = TodoistService(api_token="token_a")._get_client()
+        second = TodoistService(api_token="token_b")._get_client()
+
+        assert first is second
+        assert str(first.base_url) == "https://api.todoist.com"
+
+        await close_http_client()
+        assert first.is_closed
+        assert TodoistService(api_token="token_a")._get_client() is not first
+        await close_http_client()
+
 
 class TestRateLimiter:
     """Test rate limiter functionality."""
@@ -264,7 +346,8 @@ class TestRateLimiter:
 
     async def test_rate_limiter_window_expiry(self):
         """Test rate limiter window expiry."""
-        limiter = RateLimiter(max_requests=2, window_seconds=1)
+        now = 0.0
+        limiter = RateLimiter(max_requests=2, window_seconds=1, clock=lambda: now)
         
         # Use up the limit
         await limiter.acquire()
@@ -274,8 +357,8 @@ class TestRateLimiter:
         with pytest.raises(RateLimitError):
             await limiter.acquire()
         
-        # Wait for window to expire
-        await asyncio.sleep(1.1)
+        # Advance the clock past the window
+        now += 1.0
         
         # Should allow new request
         await limiter.acquire()
@@ -292,4 +375,35 @@ class TestRateLimiter:
             await limiter.acquire()
         
         # Retry after should be around 60 seconds
-        assert 55 <= exc_info.value.retry_after <= 60
\ No newline at end of file
+        assert 55 <= exc_info.value.retry_after <= 60
+
+    async def test_rate_limiter_sub_second_window(self):
+        """Test rate limiter accepts fractional windows."""
+        limiter = RateLimiter(max_requests=2, window_seconds=0.1)
+        
+        await limiter.acquire()
+        await limiter.acquire()
+        with pytest.raises(RateLimitError):
+            await limiter.acquire()
+        
+        await asyncio.sleep(0.11)
+        await limiter.acquire()
+
+    async def test_rate_limiter_wait_does_not_block_other_callers(self):
+        """Test a waiting acquire sleeps without holding the lock."""
+        limiter = RateLimiter(max_requests=10, window_seconds=1)
+        
+        for _ in range(10):
+            await limiter.acquire()
+        
+        # Waiter sleeps ~0.1s for the next token
+        waiter = asyncio.create_task(limiter.acquire(wait=True))
+        await asyncio.sleep(0)
+        
+        # A non-waiting caller must fail fast instead of queueing behind the sleeper
+        start = time.monotonic()
+        with pytest.raises(RateLimitError):
+            await limiter.acquire()
+        assert time.monotonic() - start < 0.05
+        
+        await asyncio.wait_for(waiter, timeout=1.0)
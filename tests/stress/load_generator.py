@@ -1,15 +1,26 @@
 """Load generator for creating realistic user behavior patterns."""
 
 import asyncio
+import bisect
+import functools
 import random
-from dataclasses import dataclass
+from collections import Counter, deque
+from dataclasses import dataclass, field
 from enum import Enum
+from itertools import accumulate, islice
 from typing import Callable, Optional
 
+import numpy as np
 from aiogram.types import Message, Update
 
 from .telegram_simulator import TelegramSimulator
 
+# Only the most recent few messages are ever sampled for edits/callbacks
+HISTORY_LIMIT = 32
+
+TASK_EMOJIS = ("📝", "🔔", "⏰", "📅", "💼")
+EDIT_SUFFIXES = (" (срочно!)", " до вечера", " - обновлено", " + купить хлеб", " в 17:00")
+
 
 class MessageType(Enum):
     """Types of messages to generate."""
@@ -20,7 +31,30 @@ class MessageType(Enum):
     CALLBACK_BUTTON = "callback"
 
 
-@dataclass
+# Order matches the cumulative thresholds compiled for a LoadProfile
+MESSAGE_TYPES = (
+    MessageType.TEXT_TASK,
+    MessageType.VOICE_MESSAGE,
+    MessageType.COMMAND,
+    MessageType.EDIT_MESSAGE,
+    MessageType.CALLBACK_BUTTON,
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_profile(percents: tuple[float, ...]) -> tuple[float, ...]:
+    """Validate message type percentages and return cumulative thresholds.
+    
+    Raises:
+        ValueError: If the percentages do not sum to 1.0
+    """
+    total = sum(percents)
+    if abs(total - 1.0) >= 0.001:
+        raise ValueError(f"Percentages must sum to 1.0, got {total}")
+    return (*accumulate(percents[:-1]), 1.0)
+
+
+@dataclass(frozen=True, slots=True)
 class LoadProfile:
     """Load profile configuration."""
     text_task_percent: float = 0.30
@@ -38,16 +72,38 @@ class LoadProfile:
     burst_size: int = 5  # Number of messages in burst
     burst_delay: float = 0.05  # Delay between burst messages
     
-    def validate(self):
-        """Validate that percentages sum to 1.0."""
-        total = (
-            self.text_task_percent + 
-            self.voice_message_percent + 
-            self.command_percent + 
-            self.edit_message_percent + 
-            self.callback_button_percent
+    # Cumulative thresholds for bisecting a uniform sample into MESSAGE_TYPES
+    _cum: tuple[float, ...] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Validate and compile the sampling table; frozen, so bypass __setattr__."""
+        object.__setattr__(self, "_cum", _compile_profile(self._percents()))
+    
+    def _percents(self) -> tuple[float, ...]:
+        """Message type percentages in MESSAGE_TYPES order."""
+        return (
+            self.text_task_percent,
+            self.voice_message_percent,
+            self.command_percent,
+            self.edit_message_percent,
+            self.callback_button_percent,
         )
-        assert abs(total - 1.0) < 0.001, f"Percentages must sum to 1.0, got {total}"
+    
+    def choose_type(self, rng: random.Random) -> MessageType:
+        """Draw one message type from rng with the profile's probabilities."""
+        return MESSAGE_TYPES[bisect.bisect_right(self._cum, rng.random())]
+    
+    def choose_types(self, rng: random.Random, k: int) -> list[MessageType]:
+        """Draw k message types from rng with the profile's probabilities."""
+        return rng.choices(MESSAGE_TYPES, cum_weights=self._cum, k=k)
+    
+    def validate(self):
+        """Validate that percentages sum to 1.0.
+        
+        Raises:
+            ValueError: If the percentages do not sum to 1.0
+        """
+        _compile_profile(self._percents())
 
 
 class UserBehavior:
@@ -63,117 +119,120 @@ class UserBehavior:
         self.user_id = user_id
         self.simulator = simulator
         self.profile = profile
-        self.message_history: list[Message] = []
-        self.task_messages: list[Message] = []  # Messages with keyboards
+        self.message_history: deque[Message] = deque(maxlen=HISTORY_LIMIT)
+        self.task_messages: dict[int, Message] = {}  # Messages with keyboards, by message_id
+        # Per-user RNG so each user's stream is independent and seeded by user_id
+        self._rng = random.Random(user_id)
+        # Sample pools are static, fetch them once per user
+        self._task_texts = simulator.get_random_task_texts()
+        self._commands = simulator.get_random_commands()
+        self._factories: dict[MessageType, Callable[[], Optional[Update]]] = {
+            MessageType.TEXT_TASK: self._create_text_task_update,
+            MessageType.VOICE_MESSAGE: self._create_voice_update,
+            MessageType.COMMAND: self._create_command_update,
+            MessageType.EDIT_MESSAGE: self._create_edit_update,
+            MessageType.CALLBACK_BUTTON: self._create_callback_update,
+        }
         
     def _choose_message_type(self) -> MessageType:
         """Choose message type based on profile probabilities."""
-        rand = random.random()
-        
-        if rand < self.profile.text_task_percent:
-            return MessageType.TEXT_TASK
-        elif rand < self.profile.text_task_percent + self.profile.voice_message_percent:
-            return MessageType.VOICE_MESSAGE
-        elif rand < self.profile.text_task_percent + self.profile.voice_message_percent + self.profile.command_percent:
-            return MessageType.COMMAND
-        elif rand < 1.0 - self.profile.callback_button_percent:
-            return MessageType.EDIT_MESSAGE
-        else:
-            return MessageType.CALLBACK_BUTTON
+        return self.profile.choose_type(self._rng)
+    
+    def choose_types(self, k: int) -> list[MessageType]:
+        """Choose k message types from this user's stream, e.g. for a burst."""
+        return self.profile.choose_types(self._rng, k)
             
-    async def generate_update(self) -> Optional[Update]:
-        """Generate a single update based on user behavior."""
-        msg_type = self._choose_message_type()
+    async def generate_update(
+        self, msg_type: Optional[MessageType] = None
+    ) -> tuple[Update, MessageType]:
+        """Generate a single update based on user behavior.
         
-        if msg_type == MessageType.TEXT_TASK:
-            return self._create_text_task_update()
-        elif msg_type == MessageType.VOICE_MESSAGE:
-            return self._create_voice_update()
-        elif msg_type == MessageType.COMMAND:
-            return self._create_command_update()
-        elif msg_type == MessageType.EDIT_MESSAGE:
-            return self._create_edit_update()
-        elif msg_type == MessageType.CALLBACK_BUTTON:
-            return self._create_callback_update()
+        Args:
+            msg_type: Type of update to generate; sampled from the profile if omitted
+            
+        Returns:
+            The update and the type actually generated. Edits and callbacks fall
+            back to a text task when there is nothing to edit or press yet.
+        """
+        if msg_type is None:
+            msg_type = self._choose_message_type()
+        update = self._factories[msg_type]()
+        if update is None:
+            msg_type = MessageType.TEXT_TASK
+            update = self._create_text_task_update()
+        return update, msg_type
             
     def _create_text_task_update(self) -> Update:
         """Create a text task update."""
-        tasks = self.simulator.get_random_task_texts()
-        text = random.choice(tasks)
+        text = self._rng.choice(self._task_texts)
         
         # Add some variety
-        if random.random() < 0.3:
+        if self._rng.random() < 0.3:
             # Add emoji
-            emojis = ["📝", "🔔", "⏰", "📅", "💼"]
-            text = f"{random.choice(emojis)} {text}"
+            text = f"{self._rng.choice(TASK_EMOJIS)} {text}"
             
         message = self.simulator.create_text_message(self.user_id, text)
         self.message_history.append(message)
         
         # Simulate that this might create a task with keyboard
-        if random.random() < 0.8:  # 80% chance it's recognized as task
+        if self._rng.random() < 0.8:  # 80% chance it's recognized as task
             task_msg = self.simulator.create_task_message_with_keyboard(
                 self.user_id,
                 text,
                 f"task_{message.message_id}"
             )
-            self.task_messages.append(task_msg)
+            self.task_messages[task_msg.message_id] = task_msg
+            if len(self.task_messages) > HISTORY_LIMIT:
+                # Evict the oldest entry; dicts keep insertion order
+                del self.task_messages[next(iter(self.task_messages))]
             
         return self.simulator.create_message_update(message)
         
     def _create_voice_update(self) -> Update:
         """Create a voice message update."""
         # Random duration between 1 and 15 seconds
-        duration = random.randint(1, 15)
+        duration = self._rng.randint(1, 15)
         message = self.simulator.create_voice_message(self.user_id, duration)
         self.message_history.append(message)
         return self.simulator.create_message_update(message)
         
     def _create_command_update(self) -> Update:
         """Create a command update."""
-        commands = self.simulator.get_random_commands()
-        cmd, args = random.choice(commands)
+        cmd, args = self._rng.choice(self._commands)
         message = self.simulator.create_command_message(self.user_id, cmd, args)
         self.message_history.append(message)
         return self.simulator.create_message_update(message)
         
     def _create_edit_update(self) -> Optional[Update]:
-        """Create an edit message update."""
+        """Create an edit message update, or None if there is nothing to edit."""
         # Need a previous message to edit
         if not self.message_history:
-            return self._create_text_task_update()
+            return None
             
         # Get a recent text message
-        text_messages = [m for m in self.message_history[-5:] if m.text]
+        text_messages = [m for m in islice(reversed(self.message_history), 5) if m.text]
         if not text_messages:
-            return self._create_text_task_update()
+            return None
             
-        original = random.choice(text_messages)
+        original = self._rng.choice(text_messages)
         
         # Create edited version
-        edits = [
-            " (срочно!)",
-            " до вечера",
-            " - обновлено",
-            " + купить хлеб",
-            " в 17:00"
-        ]
-        new_text = original.text + random.choice(edits)
+        new_text = original.text + self._rng.choice(EDIT_SUFFIXES)
         
         edited_message = self.simulator.create_edited_message(original, new_text)
         return self.simulator.create_edited_message_update(edited_message)
         
     def _create_callback_update(self) -> Optional[Update]:
-        """Create a callback query update."""
+        """Create a callback query update, or None if no task has buttons yet."""
         # Need a task message with keyboard
         if not self.task_messages:
-            return self._create_text_task_update()
+            return None
             
         # Pick a recent task
-        task_msg = random.choice(self.task_messages[-5:] if len(self.task_messages) > 5 else self.task_messages)
+        task_msg = self._rng.choice(list(islice(reversed(self.task_messages.values()), 5)))
         
         # Choose action
-        action = random.choice(["complete", "delete"])
+        action = self._rng.choice(["complete", "delete"])
         task_id = f"task_{task_msg.message_id}"
         callback_data = f"{action}_{task_id}"
         
@@ -185,7 +244,7 @@ class UserBehavior:
         
         # Remove from task messages if deleting
         if action == "delete":
-            self.task_messages = [m for m in self.task_messages if m != task_msg]
+            self.task_messages.pop(task_msg.message_id, None)
             
         return self.simulator.create_callback_query_update(callback_query)
 
@@ -201,8 +260,9 @@ class LoadGenerator:
         """Initialize load generator."""
         self.simulator = simulator
         self.profile = profile
-        self.profile.validate()
         self.users: dict[int, UserBehavior] = {}
+        self._rng = random.Random()
+        self._np_rng = np.random.default_rng()
         
     def get_or_create_user(self, user_id: int) -> UserBehavior:
         """Get or create user behavior."""
@@ -214,73 +274,84 @@ class LoadGenerator:
         self,
         user_id: int,
         message_count: int,
-        on_update: Callable[[Update], None]
+        queue: asyncio.Queue[Update]
     ) -> dict:
-        """Generate a session of user activity."""
+        """Generate a session of user activity.
+        
+        Updates are put on queue for consumers to process, so slow processing
+        applies backpressure instead of stalling generation inline.
+        """
         user = self.get_or_create_user(user_id)
         stats = {
             "user_id": user_id,
             "messages_sent": 0,
-            "message_types": {t.value: 0 for t in MessageType},
+            "message_types": {},
             "errors": 0
         }
+        type_counts: Counter[MessageType] = Counter()
+        
+        # Pre-draw the inter-message gaps and sleep to absolute deadlines, so
+        # time spent producing updates does not stretch the session
+        gaps = self._np_rng.uniform(
+            self.profile.min_delay_between_messages,
+            self.profile.max_delay_between_messages,
+            size=message_count,
+        ).tolist()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
         
-        for i in range(message_count):
+        sent = 0
+        iteration = 0
+        while sent < message_count:
+            # Check for burst behavior
+            if self._rng.random() < self.profile.burst_probability:
+                burst_count = min(self.profile.burst_size, message_count - sent)
+            else:
+                burst_count = 1
+            sent += burst_count
+            # One timestamp for the whole burst
+            self.simulator.refresh_now()
+            
             try:
-                # Check for burst behavior
-                if random.random() < self.profile.burst_probability:
-                    # Send burst
-                    burst_count = min(self.profile.burst_size, message_count - i)
-                    for j in range(burst_count):
-                        update = await user.generate_update()
-                        if update:
-                            on_update(update)
-                            stats["messages_sent"] += 1
-                            # Track type
-                            if update.message:
-                                if update.message.text and update.message.text.startswith("/"):
-                                    stats["message_types"][MessageType.COMMAND.value] += 1
-                                elif update.message.voice:
-                                    stats["message_types"][MessageType.VOICE_MESSAGE.value] += 1
-                                else:
-                                    stats["message_types"][MessageType.TEXT_TASK.value] += 1
-                            elif update.edited_message:
-                                stats["message_types"][MessageType.EDIT_MESSAGE.value] += 1
-                            elif update.callback_query:
-                                stats["message_types"][MessageType.CALLBACK_BUTTON.value] += 1
-                                
-                        if j < burst_count - 1:
-                            await asyncio.sleep(self.profile.burst_delay)
-                    i += burst_count - 1
+                if burst_count > 1:
+                    burst_types = user.choose_types(burst_count)
                 else:
-                    # Normal message
-                    update = await user.generate_update()
-                    if update:
-                        on_update(update)
-                        stats["messages_sent"] += 1
+                    burst_types = [None]
+                    
+                for j, requested_type in enumerate(burst_types):
+                    update, msg_type = await user.generate_update(requested_type)
+                    # Only pay for an awaited put when the queue is actually full
+                    try:
+                        queue.put_nowait(update)
+                    except asyncio.QueueFull:
+                        await queue.put(update)
+                    stats["messages_sent"] += 1
+                    type_counts[msg_type] += 1
+                    
+                    if j < burst_count - 1:
+                        await asyncio.sleep(self.profile.burst_delay)
                         
-                # Delay between messages
-                delay = random.uniform(
-                    self.profile.min_delay_between_messages,
-                    self.profile.max_delay_between_messages
-                )
-                await asyncio.sleep(delay)
-                
             except Exception as e:
                 stats["errors"] += 1
                 
+            # Delay between messages
+            deadline += gaps[iteration] + (burst_count - 1) * self.profile.burst_delay
+            iteration += 1
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+                
+        stats["message_types"] = {t.value: type_counts[t] for t in MessageType}
         return stats
         
     async def generate_concurrent_load(
         self,
         user_ids: list[int],
         messages_per_user: int,
-        on_update: Callable[[Update], None]
+        queue: asyncio.Queue[Update]
     ) -> list[dict]:
         """Generate load from multiple users concurrently."""
         tasks = []
         for user_id in user_ids:
-            task = self.generate_user_session(user_id, messages_per_user, on_update)
+            task = self.generate_user_session(user_id, messages_per_user, queue)
             tasks.append(task)
             
         return await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
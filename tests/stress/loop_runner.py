@@ -0,0 +1,16 @@
+"""Event loop runner shared by the stress test entrypoints."""
+
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+def run_with_fast_loop(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine on uvloop when it is installed, otherwise on the default loop."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(main)
+    return uvloop.run(main)
@@ -2,65 +2,126 @@
 
 import asyncio
 import contextlib
+import sys
 import time
 from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Dict, Optional
 
 import numpy as np
 
 
+class RingBuffer:
+    """Fixed-size numeric ring buffer over a preallocated array.
+    
+    Once full, new values overwrite the oldest ones, so the retained values
+    are not in insertion order.
+    """
+    
+    def __init__(self, capacity: int = 10000, dtype: type = np.float64):
+        """Initialize ring buffer."""
+        self._buf = np.empty(capacity, dtype=dtype)
+        self._capacity = capacity
+        self._n = 0
+        self._pos = 0
+        # Values ever appended; unlike len() it keeps growing after a wrap
+        self.total = 0
+        
+    def append(self, value: float):
+        """Store a value, overwriting the oldest once full."""
+        self._buf[self._pos] = value
+        self._pos = (self._pos + 1) % self._capacity
+        self.total += 1
+        if self._n < self._capacity:
+            self._n += 1
+            
+    def view(self) -> np.ndarray:
+        """Get the retained values without copying."""
+        return self._buf[:self._n]
+        
+    def __len__(self) -> int:
+        return self._n
+
+
 @dataclass
 class LatencyMetrics:
     """Latency metrics for a specific operation."""
-    samples: deque = field(default_factory=lambda: deque(maxlen=10000))
+    # Latencies need far less than float64 precision; float32 halves the footprint
+    samples: RingBuffer = field(default_factory=lambda: RingBuffer(dtype=np.float32))
+    _cache: Optional[tuple[Dict[str, float], Dict[str, float]]] = field(default=None, init=False, repr=False)
+    _cache_n: int = field(default=-1, init=False, repr=False)
     
     def add_sample(self, latency: float):
         """Add a latency sample in seconds."""
         self.samples.append(latency)
         
-    def get_percentiles(self) -> Dict[str, float]:
-        """Get latency percentiles in milliseconds."""
+    def compute_all(self) -> tuple[Dict[str, float], Dict[str, float]]:
+        """Get latency percentiles and basic statistics in milliseconds.
+        
+        The samples are copied into one array and scaled once, and both
+        results are derived from it. The result is cached until another
+        sample is added.
+        
+        Returns:
+            Tuple of (percentiles, stats) dictionaries
+        """
         if not self.samples:
-            return {"p50": 0, "p90": 0, "p95": 0, "p99": 0, "p99.9": 0}
+            return (
+                {"p50": 0, "p90": 0, "p95": 0, "p99": 0, "p99.9": 0},
+                {"min": 0, "max": 0, "mean": 0, "std": 0},
+            )
             
-        sorted_samples = sorted(self.samples)
-        n = len(sorted_samples)
+        if self._cache_n == self.samples.total:
+            return self._cache
+            
+        n = len(self.samples)
+        arr = self.samples.view() * np.float32(1000.0)
         
-        return {
-            "p50": sorted_samples[int(n * 0.5)] * 1000,
-            "p90": sorted_samples[int(n * 0.9)] * 1000,
-            "p95": sorted_samples[int(n * 0.95)] * 1000,
-            "p99": sorted_samples[int(n * 0.99)] * 1000,
-            "p99.9": sorted_samples[int(n * 0.999)] * 1000 if n > 1000 else sorted_samples[-1] * 1000
+        stats = {
+            "min": float(arr.min()),
+            "max": float(arr.max()),
+            "mean": float(arr.mean()),
+            "std": float(arr.std()),
         }
         
+        # Only five order statistics are needed, so partition instead of sorting
+        idx = np.array([
+            int(n * 0.5),
+            int(n * 0.9),
+            int(n * 0.95),
+            int(n * 0.99),
+            int(n * 0.999) if n > 1000 else n - 1,
+        ])
+        p50, p90, p95, p99, p999 = np.partition(arr, idx)[idx].tolist()
+        percentiles = {"p50": p50, "p90": p90, "p95": p95, "p99": p99, "p99.9": p999}
+        
+        self._cache = (percentiles, stats)
+        self._cache_n = self.samples.total
+        return self._cache
+        
+    def get_percentiles(self) -> Dict[str, float]:
+        """Get latency percentiles in milliseconds."""
+        return self.compute_all()[0]
+        
     def get_stats(self) -> Dict[str, float]:
         """Get basic statistics."""
-        if not self.samples:
-            return {"min": 0, "max": 0, "mean": 0, "std": 0}
-            
-        samples_ms = [s * 1000 for s in self.samples]
-        return {
-            "min": min(samples_ms),
-            "max": max(samples_ms),
-            "mean": np.mean(samples_ms),
-            "std": np.std(samples_ms)
-        }
+        return self.compute_all()[1]
 
 
 @dataclass
 class ErrorMetrics:
     """Error tracking metrics."""
     errors_by_type: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
-    error_samples: List[Dict[str, Any]] = field(default_factory=list)
+    # Only a handful are reported, so keep just the most recent errors
+    error_samples: deque = field(default_factory=lambda: deque(maxlen=100))
     
     def add_error(self, error_type: str, error_message: str, context: Optional[Dict] = None):
         """Add an error sample."""
         self.errors_by_type[error_type] += 1
         self.error_samples.append({
-            "timestamp": datetime.now(),
+            "timestamp": time.time(),  # Formatted only when reported
             "type": error_type,
             "message": error_message,
             "context": context or {}
@@ -77,26 +138,27 @@ class ErrorMetrics:
 @dataclass
 class ThroughputMetrics:
     """Throughput tracking metrics."""
-    request_times: deque = field(default_factory=lambda: deque(maxlen=10000))
+    request_times: RingBuffer = field(default_factory=RingBuffer)
     window_size: int = 60  # 1 minute window
     
     def add_request(self, timestamp: Optional[float] = None):
-        """Add a request timestamp."""
-        self.request_times.append(timestamp or time.time())
+        """Add a request timestamp from time.perf_counter()."""
+        self.request_times.append(time.perf_counter() if timestamp is None else timestamp)
         
     def get_current_rps(self) -> float:
         """Get current requests per second."""
         if not self.request_times:
             return 0.0
             
-        now = time.time()
-        recent_requests = [t for t in self.request_times if now - t <= self.window_size]
+        now = time.perf_counter()
+        times = self.request_times.view()
+        recent_requests = times[times >= now - self.window_size]
         
-        if len(recent_requests) < 2:
+        if recent_requests.size < 2:
             return 0.0
             
-        time_span = now - recent_requests[0]
-        return len(recent_requests) / time_span
+        time_span = now - recent_requests.min()
+        return recent_requests.size / time_span
         
     def get_peak_rps(self) -> float:
         """Get peak RPS in 1-second windows."""
@@ -104,12 +166,9 @@ class ThroughputMetrics:
             return 0.0
             
         # Count requests in 1-second buckets
-        buckets = defaultdict(int)
-        for timestamp in self.request_times:
-            bucket = int(timestamp)
-            buckets[bucket] += 1
-            
-        return max(buckets.values()) if buckets else 0.0
+        buckets = self.request_times.view().astype(np.int64)
+        counts = np.bincount(buckets - buckets.min())
+        return float(counts.max())
 
 
 class MetricsCollector:
@@ -141,9 +200,15 @@ class MetricsCollector:
         
         # Counters
         self.counters = defaultdict(int)
+        self._total_success = 0
+        self._total_error = 0
         
-        # Resource usage
-        self.resource_samples = []
+        # Resource usage, one growable column per metric
+        self._res_ts = np.empty(1024, dtype=np.float64)
+        self._res_cpu = np.empty(1024, dtype=np.float32)
+        self._res_mem = np.empty(1024, dtype=np.float32)
+        self._res_redis = np.empty(1024, dtype=np.float32)
+        self._res_n = 0
         
         # Active requests tracking
         self.active_requests = 0
@@ -160,7 +225,7 @@ class MetricsCollector:
     @contextlib.asynccontextmanager
     async def track_request(self, operation_type: str):
         """Context manager to track request latency."""
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.active_requests += 1
         self.max_concurrent_requests = max(self.max_concurrent_requests, self.active_requests)
         
@@ -168,13 +233,15 @@ class MetricsCollector:
             yield
             
             # Record success
-            latency = time.time() - start_time
+            end_time = time.perf_counter()
+            latency = end_time - start_time
             self.latencies["overall"].add_sample(latency)
             if operation_type in self.latencies:
                 self.latencies[operation_type].add_sample(latency)
                 
             self.counters[f"{operation_type}_success"] += 1
-            self.throughput.add_request()
+            self._total_success += 1
+            self.throughput.add_request(end_time)
             
         except Exception as e:
             # Record error
@@ -184,6 +251,7 @@ class MetricsCollector:
                 {"operation": operation_type}
             )
             self.counters[f"{operation_type}_error"] += 1
+            self._total_error += 1
             raise
             
         finally:
@@ -199,15 +267,28 @@ class MetricsCollector:
             self.counters[f"{api_name}_success"] += 1
         else:
             self.counters[f"{api_name}_error"] += 1
+            self._total_error += 1
             
     def add_resource_sample(self, cpu_percent: float, memory_mb: float, redis_connections: int):
         """Add resource usage sample."""
-        self.resource_samples.append({
-            "timestamp": time.time(),
-            "cpu_percent": cpu_percent,
-            "memory_mb": memory_mb,
-            "redis_connections": redis_connections
-        })
+        if self._res_n == self._res_cpu.size:
+            self._grow_resource_columns()
+            
+        i = self._res_n
+        self._res_ts[i] = time.time()
+        self._res_cpu[i] = cpu_percent
+        self._res_mem[i] = memory_mb
+        self._res_redis[i] = redis_connections
+        self._res_n = i + 1
+        
+    def _grow_resource_columns(self):
+        """Double the capacity of the resource sample columns."""
+        n = self._res_n
+        for name in ("_res_ts", "_res_cpu", "_res_mem", "_res_redis"):
+            old = getattr(self, name)
+            new = np.empty(old.size * 2, dtype=old.dtype)
+            new[:n] = old[:n]
+            setattr(self, name, new)
         
     def get_summary(self) -> Dict[str, Any]:
         """Get comprehensive metrics summary."""
@@ -215,45 +296,41 @@ class MetricsCollector:
             return {"error": "Test not started"}
             
         test_duration = (self.end_time or time.time()) - self.start_time
-        total_requests = self.counters.get("overall_success", 0) + sum(
-            v for k, v in self.counters.items() if k.endswith("_error")
-        )
+        total_requests = self._total_success + self._total_error
         
         # Calculate success rate
         success_rate = 0.0
         if total_requests > 0:
-            total_success = sum(v for k, v in self.counters.items() if k.endswith("_success"))
-            success_rate = (total_success / total_requests) * 100
+            success_rate = (self._total_success / total_requests) * 100
             
         # Get latency stats
         latency_stats = {}
         for name, metrics in self.latencies.items():
             if metrics.samples:
-                latency_stats[name] = {
-                    **metrics.get_percentiles(),
-                    **metrics.get_stats()
-                }
+                percentiles, stats = metrics.compute_all()
+                latency_stats[name] = {**percentiles, **stats}
                 
         # Get resource usage stats
         resource_stats = {}
-        if self.resource_samples:
-            cpu_values = [s["cpu_percent"] for s in self.resource_samples]
-            memory_values = [s["memory_mb"] for s in self.resource_samples]
-            redis_values = [s["redis_connections"] for s in self.resource_samples]
+        n = self._res_n
+        if n:
+            cpu_values = self._res_cpu[:n]
+            memory_values = self._res_mem[:n]
+            redis_values = self._res_redis[:n]
             
             resource_stats = {
                 "cpu": {
-                    "avg": np.mean(cpu_values),
-                    "max": max(cpu_values),
-                    "p95": np.percentile(cpu_values, 95)
+                    "avg": float(cpu_values.mean()),
+                    "max": float(cpu_values.max()),
+                    "p95": float(np.percentile(cpu_values, 95))
                 },
                 "memory_mb": {
-                    "avg": np.mean(memory_values),
-                    "max": max(memory_values)
+                    "avg": float(memory_values.mean()),
+                    "max": float(memory_values.max())
                 },
                 "redis_connections": {
-                    "avg": np.mean(redis_values),
-                    "max": max(redis_values)
+                    "avg": float(redis_values.mean()),
+                    "max": int(redis_values.max())
                 }
             }
             
@@ -271,7 +348,10 @@ class MetricsCollector:
                 "total": sum(self.errors.errors_by_type.values()),
                 "rate": self.errors.get_error_rate(total_requests),
                 "by_type": dict(self.errors.errors_by_type),
-                "samples": self.errors.error_samples[:10]  # First 10 errors
+                "samples": [  # Oldest 10 retained
+                    {**sample, "timestamp": datetime.fromtimestamp(sample["timestamp"]).isoformat()}
+                    for sample in islice(self.errors.error_samples, 10)
+                ]
             },
             "counters": dict(self.counters),
             "concurrency": {
@@ -283,46 +363,62 @@ class MetricsCollector:
     def print_summary(self):
         """Print formatted metrics summary."""
         summary = self.get_summary()
+        throughput = summary["throughput"]
+        errors = summary["errors"]
+        rule = "=" * 80
         
-        print("\n" + "="*80)
-        print("STRESS TEST METRICS SUMMARY")
-        print("="*80)
-        
-        # Basic stats
-        print(f"\nTest Duration: {summary['test_duration_seconds']:.2f} seconds")
-        print(f"Total Requests: {summary['total_requests']:,}")
-        print(f"Success Rate: {summary['success_rate']:.2f}%")
-        
-        # Throughput
-        print(f"\nThroughput:")
-        print(f"  Average: {summary['throughput']['average_rps']:.2f} req/s")
-        print(f"  Current: {summary['throughput']['current_rps']:.2f} req/s")
-        print(f"  Peak: {summary['throughput']['peak_rps']:.2f} req/s")
-        
-        # Latency
-        print(f"\nLatency (Overall):")
-        if "overall" in summary["latency"]:
-            overall = summary["latency"]["overall"]
-            print(f"  P50: {overall['p50']:.2f}ms")
-            print(f"  P90: {overall['p90']:.2f}ms")
-            print(f"  P95: {overall['p95']:.2f}ms")
-            print(f"  P99: {overall['p99']:.2f}ms")
-            print(f"  P99.9: {overall.get('p99.9', 0):.2f}ms")
-            print(f"  Mean: {overall['mean']:.2f}ms (±{overall['std']:.2f}ms)")
+        lines = [
+            "",
+            rule,
+            "STRESS TEST METRICS SUMMARY",
+            rule,
+            # Basic stats
+            "",
+            f"Test Duration: {summary['test_duration_seconds']:.2f} seconds",
+            f"Total Requests: {summary['total_requests']:,}",
+            f"Success Rate: {summary['success_rate']:.2f}%",
+            # Throughput
+            "",
+            "Throughput:",
+            f"  Average: {throughput['average_rps']:.2f} req/s",
+            f"  Current: {throughput['current_rps']:.2f} req/s",
+            f"  Peak: {throughput['peak_rps']:.2f} req/s",
+            # Latency
+            "",
+            "Latency (Overall):",
+        ]
+        overall = summary["latency"].get("overall")
+        if overall:
+            lines += [
+                f"  P50: {overall['p50']:.2f}ms",
+                f"  P90: {overall['p90']:.2f}ms",
+                f"  P95: {overall['p95']:.2f}ms",
+                f"  P99: {overall['p99']:.2f}ms",
+                f"  P99.9: {overall.get('p99.9', 0):.2f}ms",
+                f"  Mean: {overall['mean']:.2f}ms (±{overall['std']:.2f}ms)",
+            ]
             
         # Errors
-        print(f"\nErrors:")
-        print(f"  Total: {summary['errors']['total']}")
-        print(f"  Error Rate: {summary['errors']['rate']:.2f}%")
-        if summary['errors']['by_type']:
-            print("  By Type:")
-            for error_type, count in summary['errors']['by_type'].items():
-                print(f"    - {error_type}: {count}")
+        lines += [
+            "",
+            "Errors:",
+            f"  Total: {errors['total']}",
+            f"  Error Rate: {errors['rate']:.2f}%",
+        ]
+        if errors["by_type"]:
+            lines.append("  By Type:")
+            lines += [f"    - {error_type}: {count}" for error_type, count in errors["by_type"].items()]
                 
         # Resources
-        if summary.get('resources'):
-            print(f"\nResource Usage:")
-            print(f"  CPU: avg={summary['resources']['cpu']['avg']:.1f}%, max={summary['resources']['cpu']['max']:.1f}%")
-            print(f"  Memory: avg={summary['resources']['memory_mb']['avg']:.1f}MB, max={summary['resources']['memory_mb']['max']:.1f}MB")
+        resources = summary.get("resources")
+        if resources:
+            lines += [
+                "",
+                "Resource Usage:",
+                f"  CPU: avg={resources['cpu']['avg']:.1f}%, max={resources['cpu']['max']:.1f}%",
+                f"  Memory: avg={resources['memory_mb']['avg']:.1f}MB, max={resources['memory_mb']['max']:.1f}MB",
+            ]
             
-        print("="*80)
\ No newline at end of file
+        lines.append(rule)
+        # One write instead of a print (and flush) per line
+        sys.stdout.write("\n".join(lines) + "\n")
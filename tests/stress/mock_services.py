@@ -1,47 +1,227 @@
 """Realistic mock implementations of external services for stress testing."""
 
+import array
 import asyncio
 import random
 import time
+from collections import deque
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
-from unittest.mock import AsyncMock, Mock
+from enum import IntEnum
+from typing import Any, Optional
+from unittest.mock import Mock
+
+import numpy as np
 
 from src.core.exceptions import OpenAIError, RateLimitError, TodoistError, TranscriptionError
 from src.models.intent import CommandExecution, Intent, TaskCreation
 from src.models.task import TaskSchema
 
+# Keyword groups used by RealisticOpenAIMock.parse_intent
+CMD_WORDS = ("покажи", "показать", "удали", "удалить", "выполни", "выполнить")
+PROJECT_WORK = ("работ",)
+PROJECT_PERSONAL = ("дом", "личн")
+LABEL_IMPORTANT = ("важн", "срочн")
+LABEL_MEETINGS = ("встреч",)
+LABEL_CALLS = ("звон",)  # also covers "позвон"
+DUE_PATTERNS = (
+    ("завтра", "tomorrow"),
+    ("сегодня", "today"),
+    ("понедельник", "monday"),
+    ("вечер", "today 18:00"),
+)
+
+RANDOM_POOL_SIZE = 8192
+
+
+class BotMethod(IntEnum):
+    """Bot API methods counted by MockBotWithMetrics."""
+
+    SEND_MESSAGE = 0
+    ANSWER = 1
+    EDIT_MESSAGE_TEXT = 2
+    ANSWER_CALLBACK_QUERY = 3
+    DELETE_MESSAGE = 4
+    GET_FILE = 5
+    DOWNLOAD_FILE = 6
+    SEND_CHAT_ACTION = 7
+
+
+def _api_names(member: BotMethod) -> tuple[str, str]:
+    """Return the camelCase and PascalCase API names for a method."""
+    pascal = "".join(part.capitalize() for part in member.name.split("_"))
+    return pascal[0].lower() + pascal[1:], pascal
+
+
+# Both __api_method__ ("sendMessage") and class names ("SendMessage") map here
+_METHOD_TO_IDX = {name: member for member in BotMethod for name in _api_names(member)}
+
+# Returned by mocked bot methods that have no meaningful result; callers never mutate it
+_SHARED_EMPTY_MOCK = Mock()
+
+
+# Timestamp formatting is reused across calls within the same millisecond
+_last_iso_ts = 0.0
+_last_iso_str = ""
+
+
+def _cached_iso() -> str:
+    """Return the current local time in ISO format, cached at millisecond resolution."""
+    global _last_iso_ts, _last_iso_str
+    now = time.time()
+    if now - _last_iso_ts > 0.001:
+        _last_iso_ts = now
+        _last_iso_str = datetime.fromtimestamp(now).isoformat()
+    return _last_iso_str
+
+
+class _RandomPool:
+    """Uniform [0, 1) samples drawn from NumPy in bulk and handed out one at a time."""
+
+    __slots__ = ("_rng", "_values", "_idx")
+
+    def __init__(self, seed: Optional[int] = None):
+        """Initialize pool with an optional seed for repeatable runs."""
+        self._rng = np.random.default_rng(seed)
+        self._refill()
+
+    def _refill(self) -> None:
+        # tolist() so callers get plain floats rather than NumPy scalars
+        self._values = self._rng.random(RANDOM_POOL_SIZE).tolist()
+        self._idx = 0
+
+    def next(self) -> float:
+        """Return the next sample, refilling the pool when it runs out."""
+        if self._idx == RANDOM_POOL_SIZE:
+            self._refill()
+        value = self._values[self._idx]
+        self._idx += 1
+        return value
+
+
+class _PooledRandomMixin:
+    """Delay and failure draws backed by pre-generated random pools."""
+
+    def _init_random_pools(self, seed: Optional[int]) -> None:
+        self._delay_pool = _RandomPool(seed)
+        self._fail_pool = _RandomPool(None if seed is None else seed + 1)
+
+    def _next_delay(self, low: float, high: float) -> float:
+        """Return a delay drawn uniformly from [low, high)."""
+        return low + (high - low) * self._delay_pool.next()
+
+    def _next_fail(self, rate: float) -> bool:
+        """Return True with probability ``rate``."""
+        return self._fail_pool.next() < rate
+
+
+# Lightweight stand-ins for API results. Mock() construction is far too
+# expensive to do on every simulated request.
+@dataclass(slots=True)
+class FakeDue:
+    """Due date of a fake Todoist task."""
+
+    string: str
+
+
+@dataclass(slots=True)
+class FakeTask:
+    """Fake Todoist task."""
 
-class RealisticOpenAIMock:
+    id: str
+    content: str
+    project_id: Optional[str] = None
+    labels: list[str] = field(default_factory=list)
+    priority: int = 1
+    due: Optional[FakeDue] = None
+    created_at: str = ""
+
+
+@dataclass(slots=True)
+class FakeProject:
+    """Fake Todoist project."""
+
+    id: str
+    name: str
+
+
+@dataclass(slots=True)
+class FakeBotUser:
+    """Fake result of getMe."""
+
+    id: int
+    username: str
+    first_name: str
+
+
+@dataclass(slots=True)
+class FakeChat:
+    """Chat reference of a fake sent message."""
+
+    id: int
+
+
+@dataclass(slots=True)
+class FakeSentMessage:
+    """Fake result of sendMessage."""
+
+    message_id: int
+    date: datetime
+    chat: FakeChat
+    text: str
+
+
+@dataclass(slots=True)
+class FakeEditedMessage:
+    """Fake result of editMessageText."""
+
+    message_id: int
+    date: datetime
+    edited: bool = True
+
+
+@dataclass(slots=True)
+class FakeFile:
+    """Fake result of getFile."""
+
+    file_path: str
+    file_id: str = "fake_id"
+
+
+class RealisticOpenAIMock(_PooledRandomMixin):
     """Realistic mock of OpenAI service with delays and rate limiting."""
     
-    def __init__(self, failure_rate: float = 0.02, rate_limit_threshold: int = 100):
+    def __init__(
+        self, failure_rate: float = 0.02, rate_limit_threshold: int = 100, seed: Optional[int] = None
+    ):
         """Initialize mock with configurable failure rate."""
+        self._init_random_pools(seed)
         self.failure_rate = failure_rate
         self.rate_limit_threshold = rate_limit_threshold
         self.request_count = 0
-        self.request_times: list[float] = []
+        self.request_times: deque[float] = deque()
         
     async def parse_intent(self, text: str, user_language: str = "ru", forward_author: Optional[str] = None) -> Intent:
         """Mock intent parsing with realistic delays."""
         # Track requests for rate limiting
         now = time.time()
-        self.request_times = [t for t in self.request_times if now - t < 60]  # Keep last minute
+        # Keep last minute; timestamps are appended in order so expired ones sit at the head
+        while self.request_times and now - self.request_times[0] >= 60:
+            self.request_times.popleft()
         self.request_times.append(now)
         self.request_count += 1
         
         # Check rate limit
         if len(self.request_times) > self.rate_limit_threshold:
-            await asyncio.sleep(random.uniform(0.5, 1.0))
+            await asyncio.sleep(self._next_delay(0.5, 1.0))
             raise RateLimitError("OpenAI rate limit exceeded")
             
         # Simulate API delay (100-300ms)
-        delay = random.uniform(0.1, 0.3)
-        await asyncio.sleep(delay)
+        await asyncio.sleep(self._next_delay(0.1, 0.3))
         
         # Random failures
-        if random.random() < self.failure_rate:
-            if random.random() < 0.5:
+        if self._next_fail(self.failure_rate):
+            if self._next_fail(0.5):
                 raise OpenAIError("OpenAI API error: Internal server error")
             else:
                 raise RateLimitError("Rate limit exceeded")
@@ -50,7 +230,7 @@ class RealisticOpenAIMock:
         text_lower = text.lower()
         
         # Check if it's a command
-        if any(word in text_lower for word in ["покажи", "показать", "удали", "удалить", "выполни", "выполнить"]):
+        if any(word in text_lower for word in CMD_WORDS):
             # Return a command execution intent
             command_type = "view_tasks"
             if "удали" in text_lower:
@@ -66,29 +246,25 @@ class RealisticOpenAIMock:
             
         # Default to task creation
         project = "Inbox"
-        if "работ" in text_lower:
+        if any(word in text_lower for word in PROJECT_WORK):
             project = "Работа"
-        elif "дом" in text_lower or "личн" in text_lower:
+        elif any(word in text_lower for word in PROJECT_PERSONAL):
             project = "Личное"
             
         # Extract due date patterns
         due_string = None
-        if "завтра" in text_lower:
-            due_string = "tomorrow"
-        elif "сегодня" in text_lower:
-            due_string = "today"
-        elif "понедельник" in text_lower:
-            due_string = "monday"
-        elif "вечер" in text_lower:
-            due_string = "today 18:00"
+        for word, due in DUE_PATTERNS:
+            if word in text_lower:
+                due_string = due
+                break
             
         # Generate labels
         labels = []
-        if "важн" in text_lower or "срочн" in text_lower:
+        if any(word in text_lower for word in LABEL_IMPORTANT):
             labels.append("важное")
-        if "встреч" in text_lower:
+        if any(word in text_lower for word in LABEL_MEETINGS):
             labels.append("встречи")
-        if "звон" in text_lower or "позвон" in text_lower:
+        if any(word in text_lower for word in LABEL_CALLS):
             labels.append("звонки")
             
         # Create task schema
@@ -107,11 +283,12 @@ class RealisticOpenAIMock:
         )
 
 
-class RealisticDeepgramMock:
+class RealisticDeepgramMock(_PooledRandomMixin):
     """Realistic mock of Deepgram service with delays."""
     
-    def __init__(self, failure_rate: float = 0.01):
+    def __init__(self, failure_rate: float = 0.01, seed: Optional[int] = None):
         """Initialize mock."""
+        self._init_random_pools(seed)
         self.failure_rate = failure_rate
         self.transcriptions = [
             "Позвонить маме вечером",
@@ -128,26 +305,27 @@ class RealisticDeepgramMock:
         # Simulate transcription delay based on audio "duration"
         # Assume 1KB ≈ 0.1s of audio, transcription takes 0.1-0.2x real-time
         audio_duration = len(audio_data) / 10000  # Rough estimate
-        processing_time = audio_duration * random.uniform(0.1, 0.2)
+        processing_time = audio_duration * self._next_delay(0.1, 0.2)
         processing_time = max(0.2, min(processing_time, 2.0))  # Clamp between 0.2-2s
         
         await asyncio.sleep(processing_time)
         
         # Random failures
-        if random.random() < self.failure_rate:
+        if self._next_fail(self.failure_rate):
             raise TranscriptionError("Deepgram transcription failed")
             
         # Return random transcription
         return random.choice(self.transcriptions)
 
 
-class RealisticTodoistMock:
+class RealisticTodoistMock(_PooledRandomMixin):
     """Realistic mock of Todoist service with rate limiting."""
     
-    def __init__(self, failure_rate: float = 0.01):
+    def __init__(self, failure_rate: float = 0.01, seed: Optional[int] = None):
         """Initialize mock."""
+        self._init_random_pools(seed)
         self.failure_rate = failure_rate
-        self.request_times: list[float] = []
+        self.request_times: deque[float] = deque()
         self.task_counter = 1000
         self.projects = {
             "Inbox": "123456",
@@ -160,7 +338,8 @@ class RealisticTodoistMock:
         """Check Todoist rate limit (450 req/15 min)."""
         now = time.time()
         # Keep requests from last 15 minutes
-        self.request_times = [t for t in self.request_times if now - t < 900]
+        while self.request_times and now - self.request_times[0] >= 900:
+            self.request_times.popleft()
         
         if len(self.request_times) >= self.rate_limit:
             raise RateLimitError("Todoist API rate limit exceeded")
@@ -175,51 +354,42 @@ class RealisticTodoistMock:
         priority: int = 1,
         due_string: Optional[str] = None,
         due_date: Optional[str] = None
-    ) -> Mock:
+    ) -> FakeTask:
         """Mock task creation with realistic delays."""
         await self._check_rate_limit()
         
         # Simulate API delay (50-150ms)
-        await asyncio.sleep(random.uniform(0.05, 0.15))
+        await asyncio.sleep(self._next_delay(0.05, 0.15))
         
         # Random failures
-        if random.random() < self.failure_rate:
+        if self._next_fail(self.failure_rate):
             raise TodoistError("Failed to create task")
             
         self.task_counter += 1
         
-        # Create mock task
-        task = Mock()
-        task.id = str(self.task_counter)
-        task.content = content
-        task.project_id = project_id or self.projects["Inbox"]
-        task.labels = labels or []
-        task.priority = priority
-        task.due = Mock(string=due_string) if due_string else None
-        task.created_at = datetime.now().isoformat()
-        
-        return task
+        return FakeTask(
+            id=str(self.task_counter),
+            content=content,
+            project_id=project_id or self.projects["Inbox"],
+            labels=labels or [],
+            priority=priority,
+            due=FakeDue(string=due_string) if due_string else None,
+            created_at=_cached_iso(),
+        )
         
-    async def get_projects(self) -> list[Mock]:
+    async def get_projects(self) -> list[FakeProject]:
         """Mock getting projects."""
         await self._check_rate_limit()
-        await asyncio.sleep(random.uniform(0.05, 0.1))
+        await asyncio.sleep(self._next_delay(0.05, 0.1))
         
-        projects = []
-        for name, pid in self.projects.items():
-            project = Mock()
-            project.name = name
-            project.id = pid
-            projects.append(project)
-            
-        return projects
+        return [FakeProject(id=pid, name=name) for name, pid in self.projects.items()]
         
     async def complete_task(self, task_id: str) -> bool:
         """Mock task completion."""
         await self._check_rate_limit()
-        await asyncio.sleep(random.uniform(0.05, 0.1))
+        await asyncio.sleep(self._next_delay(0.05, 0.1))
         
-        if random.random() < self.failure_rate:
+        if self._next_fail(self.failure_rate):
             raise TodoistError("Failed to complete task")
             
         return True
@@ -227,121 +397,109 @@ class RealisticTodoistMock:
     async def delete_task(self, task_id: str) -> bool:
         """Mock task deletion."""
         await self._check_rate_limit()
-        await asyncio.sleep(random.uniform(0.05, 0.1))
+        await asyncio.sleep(self._next_delay(0.05, 0.1))
         
-        if random.random() < self.failure_rate:
+        if self._next_fail(self.failure_rate):
             raise TodoistError("Failed to delete task")
             
         return True
         
-    async def get_tasks(self, filter: Optional[str] = None) -> list[Mock]:
+    async def get_tasks(self, filter: Optional[str] = None) -> list[FakeTask]:
         """Mock getting tasks."""
         await self._check_rate_limit()
-        await asyncio.sleep(random.uniform(0.1, 0.2))
+        await asyncio.sleep(self._next_delay(0.1, 0.2))
         
         # Return some mock tasks
-        tasks = []
-        for i in range(5):
-            task = Mock()
-            task.id = str(self.task_counter - i)
-            task.content = f"Task {i+1}"
-            task.created_at = datetime.now().isoformat()
-            tasks.append(task)
-            
-        return tasks
+        created_at = _cached_iso()
+        return [
+            FakeTask(id=str(self.task_counter - i), content=f"Task {i+1}", created_at=created_at)
+            for i in range(5)
+        ]
 
 
-class MockBotWithMetrics:
+class MockBotWithMetrics(_PooledRandomMixin):
     """Mock bot that tracks all method calls for metrics."""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         """Initialize mock bot."""
-        self.metrics = {
-            "send_message": 0,
-            "answer": 0,
-            "edit_message_text": 0,
-            "answer_callback_query": 0,
-            "delete_message": 0,
-            "get_file": 0,
-            "download_file": 0,
-            "send_chat_action": 0
-        }
+        self._init_random_pools(seed)
+        self.counts = array.array("Q", [0] * len(BotMethod))
         self.errors = []
         
         # Bot attributes required by aiogram
         self.id = 123456789  # Bot ID
         
         # Create async mocks
-        self.send_message = self._create_tracked_mock("send_message")
-        self.answer = self._create_tracked_mock("answer")
-        self.edit_message_text = self._create_tracked_mock("edit_message_text")
-        self.answer_callback_query = self._create_tracked_mock("answer_callback_query")
-        self.delete_message = self._create_tracked_mock("delete_message")
-        self.get_file = self._create_tracked_mock("get_file", return_value=Mock(file_path="fake_path"))
-        self.download_file = self._create_tracked_mock("download_file", return_value=b"fake audio data")
-        self.send_chat_action = self._create_tracked_mock("send_chat_action", return_value=True)
+        self.send_message = self._create_tracked_mock(BotMethod.SEND_MESSAGE)
+        self.answer = self._create_tracked_mock(BotMethod.ANSWER)
+        self.edit_message_text = self._create_tracked_mock(BotMethod.EDIT_MESSAGE_TEXT)
+        self.answer_callback_query = self._create_tracked_mock(BotMethod.ANSWER_CALLBACK_QUERY)
+        self.delete_message = self._create_tracked_mock(BotMethod.DELETE_MESSAGE)
+        self.get_file = self._create_tracked_mock(BotMethod.GET_FILE, return_value=FakeFile(file_path="fake_path"))
+        self.download_file = self._create_tracked_mock(BotMethod.DOWNLOAD_FILE, return_value=b"fake audio data")
+        self.send_chat_action = self._create_tracked_mock(BotMethod.SEND_CHAT_ACTION, return_value=True)
         
         # Bot info
-        self.get_me = AsyncMock(return_value=Mock(id=self.id, username="test_bot", first_name="Test Bot"))
+        self._me = FakeBotUser(id=self.id, username="test_bot", first_name="Test Bot")
+        
+    async def get_me(self) -> FakeBotUser:
+        """Return bot info."""
+        return self._me
     
     async def __call__(self, method, request_timeout=None):
         """Handle method calls from aiogram."""
         # Get method name from the method object
         method_name = method.__api_method__ if hasattr(method, '__api_method__') else type(method).__name__
         
-        # Track the call
-        if method_name.lower() in self.metrics:
-            self.metrics[method_name.lower()] += 1
-        else:
-            # Track under general category
-            self.metrics["send_message"] += 1
+        # Track the call, unknown methods go under the general category
+        self.counts[_METHOD_TO_IDX.get(method_name, BotMethod.SEND_MESSAGE)] += 1
         
         # Add small delay to simulate network
-        await asyncio.sleep(random.uniform(0.01, 0.03))
+        await asyncio.sleep(self._next_delay(0.01, 0.03))
         
         # Return appropriate mock response based on method type
         if method_name == "SendMessage" or method_name == "sendMessage":
-            return Mock(
+            return FakeSentMessage(
                 message_id=random.randint(1000, 9999),
                 date=datetime.now(),
-                chat=Mock(id=method.chat_id if hasattr(method, 'chat_id') else 123),
-                text=method.text if hasattr(method, 'text') else "test"
+                chat=FakeChat(id=getattr(method, 'chat_id', 123)),
+                text=getattr(method, 'text', "test")
             )
         elif method_name == "EditMessageText" or method_name == "editMessageText":
-            return Mock(
-                message_id=method.message_id if hasattr(method, 'message_id') else random.randint(1000, 9999),
-                date=datetime.now(),
-                edited=True
+            return FakeEditedMessage(
+                message_id=getattr(method, 'message_id', random.randint(1000, 9999)),
+                date=datetime.now()
             )
         elif method_name == "AnswerCallbackQuery" or method_name == "answerCallbackQuery":
             return True
         elif method_name == "DeleteMessage" or method_name == "deleteMessage":
             return True
         elif method_name == "GetFile" or method_name == "getFile":
-            return Mock(file_path="fake_path", file_id="fake_id")
+            return FakeFile(file_path="fake_path")
         elif method_name == "SendChatAction" or method_name == "sendChatAction":
             return True
         else:
             # Generic response
-            return Mock()
+            return _SHARED_EMPTY_MOCK
         
-    def _create_tracked_mock(self, method_name: str, **kwargs):
+    def _create_tracked_mock(self, method: BotMethod, return_value: Any = _SHARED_EMPTY_MOCK):
         """Create a mock that tracks calls."""
+        counts = self.counts
+        idx = int(method)
+        next_delay = self._next_delay
+
         async def tracked_method(*args, **kw):
-            self.metrics[method_name] += 1
+            counts[idx] += 1
             # Add small delay to simulate network
-            await asyncio.sleep(random.uniform(0.01, 0.03))
-            if "return_value" in kwargs:
-                return kwargs["return_value"]
-            return Mock()
+            await asyncio.sleep(next_delay(0.01, 0.03))
+            return return_value
             
         return tracked_method
         
     def get_metrics_summary(self) -> dict:
         """Get summary of all bot method calls."""
-        total_calls = sum(self.metrics.values())
         return {
-            "total_calls": total_calls,
-            "methods": self.metrics.copy(),
+            "total_calls": sum(self.counts),
+            "methods": {method.name.lower(): self.counts[method] for method in BotMethod},
             "errors": len(self.errors)
         }
\ No newline at end of file
@@ -1,10 +1,15 @@
-"""Telegram API simulator for stress testing with proper aiogram 3 Update objects."""
+"""Telegram API simulator for stress testing with proper aiogram 3 Update objects.
 
+Messages and updates are built with ``model_construct`` and ``model_copy``,
+which skip Pydantic validation. All values passed in must therefore already
+have the field types aiogram expects.
+"""
+
+import itertools
 import random
 import time
 from datetime import datetime
 from typing import Optional
-from unittest.mock import AsyncMock
 
 from aiogram.types import (
     CallbackQuery,
@@ -19,44 +24,132 @@ from aiogram.types import (
 )
 
 
+TASK_TEXTS: tuple[str, ...] = (
+    "Купить молоко завтра в 10:00",
+    "Позвонить маме вечером",
+    "Встреча с клиентом в понедельник в 15:00",
+    "Оплатить счета до конца месяца",
+    "Записаться к врачу на следующей неделе",
+    "Подготовить презентацию к пятнице",
+    "Отправить отчет руководителю до 18:00",
+    "Забрать документы из офиса",
+    "Проверить почту и ответить на важные письма",
+    "Сделать резервную копию данных",
+)
+
+COMMANDS: tuple[tuple[str, str], ...] = (
+    ("start", ""),
+    ("help", ""),
+    ("setup", ""),
+    ("recent", ""),
+    ("recent", "5"),
+    ("undo", ""),
+    ("autodelete", ""),
+    ("status", ""),
+)
+
+
+def _command_entities(command: str) -> list[MessageEntity]:
+    """Build the bot_command entity list for a command message."""
+    return [MessageEntity(type="bot_command", offset=0, length=len(command) + 1)]
+
+
+# Entities for the known commands never change, so build them once
+COMMAND_ENTITIES: dict[str, list[MessageEntity]] = {
+    command: _command_entities(command) for command, _ in COMMANDS
+}
+
+
 class TelegramSimulator:
     """Simulates Telegram API interactions with proper Update objects."""
 
     def __init__(self):
         """Initialize the simulator."""
-        self.update_id_counter = random.randint(100000, 999999)
-        self.message_id_counter = random.randint(1000, 9999)
+        # ID generators; count.__next__ is a single C call per ID
+        self._next_update_id = itertools.count(1).__next__
+        self._next_message_id = itertools.count(1).__next__
+        # Users and chats never change during a run, so build them once per user
+        self._user_cache: dict[int, User] = {}
+        self._chat_cache: dict[int, Chat] = {}
+        # Per-user Message templates and a shared Update template. New objects
+        # are shallow copies with the varying fields patched in, which skips
+        # model_construct's walk over every field default (~100 on Message)
+        self._message_templates: dict[int, Message] = {}
+        self._update_template = Update.model_construct()
+        # Metrics category of each generated update, keyed by update_id, so
+        # consumers can look it up instead of inspecting the update again
+        self.update_types: dict[int, str] = {}
+        # Set by producers once per batch; Telegram dates have second granularity
+        # anyway, so messages generated together can share one timestamp
+        self._cached_now: Optional[datetime] = None
+        # Bot that generated objects are bound to, see mount_bot()
+        self._bot = None
+        
+    def mount_bot(self, bot) -> None:
+        """Bind all generated objects to a bot instance.
         
-    def _next_update_id(self) -> int:
-        """Get next update ID."""
-        self.update_id_counter += 1
-        return self.update_id_counter
+        Dispatcher.feed_update re-validates any update whose bot differs from
+        the one it is fed with, so pre-mounted updates skip that round-trip.
+        """
+        self._bot = bot
+        for obj in (
+            *self._user_cache.values(),
+            *self._chat_cache.values(),
+            *self._message_templates.values(),
+            self._update_template,
+        ):
+            obj.as_(bot)
         
-    def _next_message_id(self) -> int:
-        """Get next message ID."""
-        self.message_id_counter += 1
-        return self.message_id_counter
+    def refresh_now(self) -> None:
+        """Capture the timestamp used for messages until the next refresh."""
+        self._cached_now = datetime.now()
+        
+    def _now(self) -> datetime:
+        """Get the cached timestamp, or the current time if none was captured."""
+        return self._cached_now or datetime.now()
         
     def create_user(self, user_id: int) -> User:
-        """Create a User object."""
-        return User(
-            id=user_id,
-            is_bot=False,
-            first_name=f"User{user_id}",
-            last_name=f"Test{user_id}",
-            username=f"user{user_id}",
-            language_code="ru"
-        )
+        """Create a User object (cached per user ID)."""
+        user = self._user_cache.get(user_id)
+        if user is None:
+            user = self._user_cache[user_id] = User(
+                id=user_id,
+                is_bot=False,
+                first_name=f"User{user_id}",
+                last_name=f"Test{user_id}",
+                username=f"user{user_id}",
+                language_code="ru"
+            ).as_(self._bot)
+        return user
         
     def create_chat(self, user_id: int) -> Chat:
-        """Create a private Chat object."""
-        return Chat(
-            id=user_id,
-            type="private",
-            first_name=f"User{user_id}",
-            last_name=f"Test{user_id}",
-            username=f"user{user_id}"
-        )
+        """Create a private Chat object (cached per user ID)."""
+        chat = self._chat_cache.get(user_id)
+        if chat is None:
+            chat = self._chat_cache[user_id] = Chat(
+                id=user_id,
+                type="private",
+                first_name=f"User{user_id}",
+                last_name=f"Test{user_id}",
+                username=f"user{user_id}"
+            ).as_(self._bot)
+        return chat
+        
+    def _new_message(self, user_id: int, **fields) -> Message:
+        """Create a Message from the user's template with the given fields set."""
+        template = self._message_templates.get(user_id)
+        if template is None:
+            template = self._message_templates[user_id] = Message.model_construct(
+                chat=self.create_chat(user_id),
+                from_user=self.create_user(user_id)
+            ).as_(self._bot)
+        return template.model_copy(update=fields)
+        
+    def _new_update(self, update_type: str, **fields) -> Update:
+        """Create an Update from the shared template with the given fields set."""
+        update_id = self._next_update_id()
+        self.update_types[update_id] = update_type
+        return self._update_template.model_copy(update={"update_id": update_id, **fields})
         
     def create_text_message(
         self, 
@@ -65,11 +158,10 @@ class TelegramSimulator:
         message_id: Optional[int] = None
     ) -> Message:
         """Create a text Message object."""
-        return Message(
+        return self._new_message(
+            user_id,
             message_id=message_id or self._next_message_id(),
-            date=datetime.now(),
-            chat=self.create_chat(user_id),
-            from_user=self.create_user(user_id),
+            date=self._now(),
             text=text,
             entities=[]
         )
@@ -82,12 +174,11 @@ class TelegramSimulator:
     ) -> Message:
         """Create a voice Message object."""
         msg_id = message_id or self._next_message_id()
-        return Message(
+        return self._new_message(
+            user_id,
             message_id=msg_id,
-            date=datetime.now(),
-            chat=self.create_chat(user_id),
-            from_user=self.create_user(user_id),
-            voice=Voice(
+            date=self._now(),
+            voice=Voice.model_construct(
                 file_id=f"voice_{msg_id}_{user_id}",
                 file_unique_id=f"voice_unique_{msg_id}",
                 duration=duration,
@@ -108,20 +199,12 @@ class TelegramSimulator:
             
         msg_id = self._next_message_id()
         
-        # Create command entity
-        entities = [
-            MessageEntity(
-                type="bot_command",
-                offset=0,
-                length=len(f"/{command}")
-            )
-        ]
+        entities = COMMAND_ENTITIES.get(command) or _command_entities(command)
         
-        return Message(
+        return self._new_message(
+            user_id,
             message_id=msg_id,
-            date=datetime.now(),
-            chat=self.create_chat(user_id),
-            from_user=self.create_user(user_id),
+            date=self._now(),
             text=text,
             entities=entities
         )
@@ -139,7 +222,7 @@ class TelegramSimulator:
             message=message,
             data=callback_data,
             chat_instance=str(user_id)
-        )
+        ).as_(self._bot)
         
     def create_edited_message(
         self,
@@ -148,36 +231,32 @@ class TelegramSimulator:
     ) -> Message:
         """Create an edited Message object."""
         # Create a new message with same ID but different text
-        return Message(
+        return self._new_message(
+            original_message.from_user.id,
             message_id=original_message.message_id,
             date=original_message.date,
-            chat=original_message.chat,
-            from_user=original_message.from_user,
             text=new_text,
-            edit_date=datetime.now(),
+            edit_date=int(self._now().timestamp()),  # Unix time, as in the Bot API
             entities=[]
         )
         
     def create_message_update(self, message: Message) -> Update:
         """Create an Update with a message."""
-        return Update(
-            update_id=self._next_update_id(),
-            message=message
-        )
+        if message.voice:
+            update_type = "voice_message"
+        elif message.text and message.text.startswith("/"):
+            update_type = "command"
+        else:
+            update_type = "text_message"
+        return self._new_update(update_type, message=message)
         
     def create_edited_message_update(self, edited_message: Message) -> Update:
         """Create an Update with an edited message."""
-        return Update(
-            update_id=self._next_update_id(),
-            edited_message=edited_message
-        )
+        return self._new_update("edit_message", edited_message=edited_message)
         
     def create_callback_query_update(self, callback_query: CallbackQuery) -> Update:
         """Create an Update with a callback query."""
-        return Update(
-            update_id=self._next_update_id(),
-            callback_query=callback_query
-        )
+        return self._new_update("callback", callback_query=callback_query)
         
     def create_task_message_with_keyboard(
         self,
@@ -193,41 +272,20 @@ class TelegramSimulator:
             ]
         ])
         
-        msg = self.create_text_message(user_id, f"✅ Задача создана:\n\n{task_text}")
         # In real scenario, this would be sent by bot, but for testing we simulate it
-        msg.reply_markup = keyboard
-        return msg
-        
-    def attach_mock_bot_to_message(self, message: Message, bot_mock: AsyncMock) -> None:
-        """Attach mock bot to message for handlers that expect message.bot."""
-        # Since Message is frozen, we can't add attributes
-        # Instead, handlers should get bot from context data
-        pass
+        return self._new_message(
+            user_id,
+            message_id=self._next_message_id(),
+            date=self._now(),
+            text=f"✅ Задача создана:\n\n{task_text}",
+            entities=[],
+            reply_markup=keyboard
+        )
         
-    def get_random_task_texts(self) -> list[str]:
+    def get_random_task_texts(self) -> tuple[str, ...]:
         """Get list of random task texts for testing."""
-        return [
-            "Купить молоко завтра в 10:00",
-            "Позвонить маме вечером",
-            "Встреча с клиентом в понедельник в 15:00",
-            "Оплатить счета до конца месяца",
-            "Записаться к врачу на следующей неделе",
-            "Подготовить презентацию к пятнице",
-            "Отправить отчет руководителю до 18:00",
-            "Забрать документы из офиса",
-            "Проверить почту и ответить на важные письма",
-            "Сделать резервную копию данных"
-        ]
-        
-    def get_random_commands(self) -> list[tuple[str, str]]:
+        return TASK_TEXTS
+        
+    def get_random_commands(self) -> tuple[tuple[str, str], ...]:
         """Get list of random commands for testing."""
-        return [
-            ("start", ""),
-            ("help", ""),
-            ("setup", ""),
-            ("recent", ""),
-            ("recent", "5"),
-            ("undo", ""),
-            ("autodelete", ""),
-            ("status", "")
-        ]
\ No newline at end of file
+        return COMMANDS
@@ -3,12 +3,14 @@
 import asyncio
 import logging
 import sys
+from collections import Counter
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from tests.stress.load_generator import LoadProfile
+from tests.stress.loop_runner import run_with_fast_loop
 from tests.stress.test_real_stress import StressTestApplication
 
 logging.basicConfig(level=logging.INFO)
@@ -44,29 +46,24 @@ async def test_quick_verify():
         app.metrics.start_test()
         
         # Generate test load
-        updates = []
-        
-        def on_update(update):
-            updates.append(update)
+        updates_queue = asyncio.Queue()
             
         await app.load_gen.generate_concurrent_load(
             user_ids=[1, 2, 3, 4, 5],
             messages_per_user=10,
-            on_update=on_update
+            queue=updates_queue
         )
+        updates = [updates_queue.get_nowait() for _ in range(updates_queue.qsize())]
         
         logger.info(f"Generated {len(updates)} updates")
         
         # Log sample update types
-        update_types = {}
-        for update in updates[:20]:
-            if update.message:
-                update_types['message'] = update_types.get('message', 0) + 1
-            elif update.callback_query:
-                update_types['callback'] = update_types.get('callback', 0) + 1
-            elif update.edited_message:
-                update_types['edit'] = update_types.get('edit', 0) + 1
-        logger.info(f"Update types: {update_types}")
+        update_types = Counter(
+            'message' if update.message else 'callback' if update.callback_query else 'edit'
+            for update in updates[:20]
+            if update.message or update.callback_query or update.edited_message
+        )
+        logger.info(f"Update types: {dict(update_types)}")
         
         # Process updates
         process_tasks = [app.process_update(update) for update in updates[:20]]  # Process first 20
@@ -105,4 +102,4 @@ async def test_quick_verify():
 
 
 if __name__ == "__main__":
-    asyncio.run(test_quick_verify())
\ No newline at end of file
+    run_with_fast_loop(test_quick_verify())
\ No newline at end of file
@@ -6,13 +6,14 @@ import os
 import sys
 import time
 from typing import Optional
-from unittest.mock import AsyncMock, Mock, patch
+from unittest.mock import patch
 
 import psutil
 import pytest
 from aiogram import Bot, Dispatcher
 from aiogram.types import Update
 from redis.asyncio import Redis
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
@@ -28,10 +29,11 @@ from src.core.redis_storage import RetryRedisStorage
 from src.core.settings import get_settings
 from src.handlers import callback_router, command_router, edit_router, error_router, message_router
 from src.middleware.auth import AuthMiddleware
-from src.repositories.user import UserRepository
+from src.models.db import User
 from src.services.encryption import EncryptionService
 
 from .load_generator import LoadGenerator, LoadProfile
+from .loop_runner import run_with_fast_loop
 from .metrics_collector import MetricsCollector
 from .mock_services import MockBotWithMetrics, RealisticDeepgramMock, RealisticOpenAIMock, RealisticTodoistMock
 from .telegram_simulator import TelegramSimulator
@@ -40,7 +42,6 @@ from .telegram_simulator import TelegramSimulator
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
-
 class StressTestApplication:
     """Stress test application with realistic bot setup."""
 
@@ -63,6 +64,9 @@ class StressTestApplication:
         self.telegram_sim = TelegramSimulator()
         self.load_gen = LoadGenerator(self.telegram_sim)
         
+        # Service patches, active from setup() until cleanup()
+        self._patchers = []
+        
     async def setup(self):
         """Setup test application."""
         logger.info("Setting up stress test application...")
@@ -77,6 +81,7 @@ class StressTestApplication:
         
         # Create bot mock
         self.bot_mock = MockBotWithMetrics()
+        self.telegram_sim.mount_bot(self.bot_mock)
         
         # Create dispatcher
         self.dispatcher = Dispatcher(
@@ -108,34 +113,59 @@ class StressTestApplication:
         self.dispatcher.edited_message.middleware(UserContextMiddleware())
         self.dispatcher.edited_message.middleware(AuthMiddleware())
         
+        # Patch external services once for the whole run
+        self._patchers = [
+            patch('src.services.openai_service.OpenAIService.parse_intent', self.openai_mock.parse_intent),
+            patch('src.services.deepgram_service.DeepgramService.transcribe', self.deepgram_mock.transcribe),
+            patch('src.services.todoist_service.TodoistService.create_task', self.todoist_mock.create_task),
+            patch('src.services.todoist_service.TodoistService.get_projects', self.todoist_mock.get_projects),
+            patch('src.services.todoist_service.TodoistService.complete_task', self.todoist_mock.complete_task),
+            patch('src.services.todoist_service.TodoistService.delete_task', self.todoist_mock.delete_task),
+            patch('src.services.todoist_service.TodoistService.get_tasks', self.todoist_mock.get_tasks),
+        ]
+        for patcher in self._patchers:
+            patcher.start()
+        
         logger.info("Stress test application setup complete")
         
     async def _create_test_users(self, count: int = 200, reuse_existing: bool = True):
         """Create test users with Todoist tokens."""
         logger.info(f"Creating {count} test users...")
-        encryption = EncryptionService()
+        # Todoist is mocked, so every user can share one encrypted token
+        encrypted_token = EncryptionService().encrypt("test_todoist_token")
+        
+        # Upsert all users in a single statement instead of a round-trip per user
+        stmt = pg_insert(User).values([
+            {
+                "id": user_id,
+                "username": f"stressuser{user_id}",
+                "first_name": f"Stress{user_id}",
+                "language_code": "ru",
+                "todoist_token_encrypted": encrypted_token,
+            }
+            for user_id in range(1, count + 1)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "username": stmt.excluded.username,
+                "first_name": stmt.excluded.first_name,
+                "language_code": stmt.excluded.language_code,
+                "todoist_token_encrypted": stmt.excluded.todoist_token_encrypted,
+            },
+        )
         
         async with self.database.get_session() as session:
-            user_repo = UserRepository(session)
-            
-            for user_id in range(1, count + 1):
-                user = await user_repo.create_or_update(
-                    user_id=user_id,
-                    username=f"stressuser{user_id}",
-                    first_name=f"Stress{user_id}",
-                    language_code="ru"
-                )
-                
-                # Set encrypted token
-                encrypted_token = encryption.encrypt(f"test_todoist_token_{user_id}")
-                await user_repo.update_todoist_token(user_id, encrypted_token)
-                
+            await session.execute(stmt)
             await session.commit()
             
         logger.info("Test users created")
         
     async def cleanup(self):
         """Cleanup resources."""
+        for patcher in reversed(self._patchers):
+            patcher.stop()
+        self._patchers = []
         if self.redis:
             await self.redis.close()
         if self.database:
@@ -143,23 +173,12 @@ class StressTestApplication:
             
     async def process_update(self, update: Update):
         """Process a single update through the dispatcher."""
-        async with self.metrics.track_request(self._get_update_type(update)):
-            # Track API calls
-            openai_start = time.time()
-            deepgram_start = time.time()
-            todoist_start = time.time()
-            
-            # Patch services with tracking
-            with patch('src.services.openai_service.OpenAIService.parse_intent', self.openai_mock.parse_intent), \
-                 patch('src.services.deepgram_service.DeepgramService.transcribe', self.deepgram_mock.transcribe), \
-                 patch('src.services.todoist_service.TodoistService.create_task', self.todoist_mock.create_task), \
-                 patch('src.services.todoist_service.TodoistService.get_projects', self.todoist_mock.get_projects), \
-                 patch('src.services.todoist_service.TodoistService.complete_task', self.todoist_mock.complete_task), \
-                 patch('src.services.todoist_service.TodoistService.delete_task', self.todoist_mock.delete_task), \
-                 patch('src.services.todoist_service.TodoistService.get_tasks', self.todoist_mock.get_tasks):
-                
-                # Process update
-                await self.dispatcher.feed_raw_update(self.bot_mock, update.model_dump())
+        # Services are patched in setup(), so this only feeds the dispatcher.
+        # Updates come pre-mounted to bot_mock, so feed_update skips the
+        # dump/re-validate round-trip that feed_raw_update would do.
+        update_type = self.telegram_sim.update_types.pop(update.update_id, None) or self._get_update_type(update)
+        async with self.metrics.track_request(update_type):
+            await self.dispatcher.feed_update(self.bot_mock, update)
                 
     def _get_update_type(self, update: Update) -> str:
         """Determine update type for metrics."""
@@ -179,26 +198,59 @@ class StressTestApplication:
     async def monitor_resources(self, interval: float = 1.0):
         """Monitor system resources during test."""
         process = psutil.Process()
+        # First non-blocking call only primes the counter and returns 0.0
+        process.cpu_percent(interval=None)
         
         while True:
             try:
-                # Get CPU and memory usage
-                cpu_percent = process.cpu_percent(interval=0.1)
+                await asyncio.sleep(interval)
+                
+                # Get CPU (usage since the previous call, without blocking the loop) and memory usage
+                cpu_percent = process.cpu_percent(interval=None)
                 memory_info = process.memory_info()
                 memory_mb = memory_info.rss / 1024 / 1024
                 
                 # Get Redis connection count
-                redis_info = await self.redis.info()
+                redis_info = await asyncio.wait_for(self.redis.info(), timeout=0.5)
                 redis_connections = redis_info.get('connected_clients', 0)
                 
                 self.metrics.add_resource_sample(cpu_percent, memory_mb, redis_connections)
-                
-                await asyncio.sleep(interval)
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 logger.error(f"Resource monitoring error: {e}")
                 
+    async def _run_queued_load(self, num_users: int, messages_per_user: int, num_consumers: int = 10):
+        """Feed generated load through a bounded queue to a fixed pool of consumers."""
+        # Small enough to backpressure the producer, large enough to keep every consumer busy
+        updates_queue: asyncio.Queue[Optional[Update]] = asyncio.Queue(maxsize=num_consumers * 4)
+        
+        async def produce_updates():
+            try:
+                await self.load_gen.generate_concurrent_load(
+                    user_ids=list(range(1, num_users + 1)),
+                    messages_per_user=messages_per_user,
+                    queue=updates_queue
+                )
+            finally:
+                # One sentinel per consumer, queued behind all real updates
+                for _ in range(num_consumers):
+                    await updates_queue.put(None)
+                    
+        async def consume_updates():
+            while (update := await updates_queue.get()) is not None:
+                try:
+                    await self.process_update(update)
+                except Exception as e:
+                    logger.error(f"Error processing update: {e}")
+                    
+        producer = asyncio.create_task(produce_updates())
+        consumers = [asyncio.create_task(consume_updates()) for _ in range(num_consumers)]
+        
+        # Wait for completion
+        await producer
+        await asyncio.gather(*consumers, return_exceptions=True)
+        
     async def run_baseline_test(self):
         """Run baseline test: 50 users, 1 msg/sec each, 5 minutes."""
         logger.info("\n" + "="*80)
@@ -216,43 +268,7 @@ class StressTestApplication:
             test_duration = 300  # 5 minutes
             messages_per_user = test_duration  # 1 per second
             
-            updates_queue = asyncio.Queue(maxsize=1000)
-            
-            # Producer task
-            async def produce_updates():
-                def on_update(update: Update):
-                    asyncio.create_task(updates_queue.put(update))
-                    
-                await self.load_gen.generate_concurrent_load(
-                    user_ids=list(range(1, num_users + 1)),
-                    messages_per_user=messages_per_user,
-                    on_update=on_update
-                )
-                
-            # Consumer tasks
-            async def consume_updates():
-                while True:
-                    try:
-                        update = await asyncio.wait_for(updates_queue.get(), timeout=1.0)
-                        await self.process_update(update)
-                    except asyncio.TimeoutError:
-                        if updates_queue.empty():
-                            break
-                    except Exception as e:
-                        logger.error(f"Error processing update: {e}")
-                        
-            # Start producer
-            producer = asyncio.create_task(produce_updates())
-            
-            # Start multiple consumers
-            consumers = [
-                asyncio.create_task(consume_updates())
-                for _ in range(10)  # 10 concurrent processors
-            ]
-            
-            # Wait for completion
-            await producer
-            await asyncio.gather(*consumers, return_exceptions=True)
+            await self._run_queued_load(num_users, messages_per_user)
             
         finally:
             monitor_task.cancel()
@@ -287,24 +303,29 @@ class StressTestApplication:
             num_users = 100
             messages_per_user = 5
             
-            updates = []
-            
-            def on_update(update: Update):
-                updates.append(update)
+            updates_queue = asyncio.Queue()
                 
             # Generate all updates
             logger.info("Generating burst updates...")
             await burst_gen.generate_concurrent_load(
                 user_ids=list(range(1, num_users + 1)),
                 messages_per_user=messages_per_user,
-                on_update=on_update
+                queue=updates_queue
             )
+            updates = [updates_queue.get_nowait() for _ in range(updates_queue.qsize())]
             
             logger.info(f"Processing {len(updates)} updates...")
             start_time = time.time()
             
-            # Process all updates concurrently
-            tasks = [self.process_update(update) for update in updates]
+            # Process updates concurrently, capped so thousands of handler
+            # frames are not all alive at once
+            semaphore = asyncio.Semaphore(200)
+            
+            async def process_bounded(update: Update):
+                async with semaphore:
+                    await self.process_update(update)
+                    
+            tasks = [process_bounded(update) for update in updates]
             await asyncio.gather(*tasks, return_exceptions=True)
             
             burst_duration = time.time() - start_time
@@ -336,7 +357,6 @@ class StressTestApplication:
             messages_per_user = test_duration // 2  # ~1 msg per 2 seconds
             status_interval = 300  # Status every 5 minutes
             
-            updates_queue = asyncio.Queue(maxsize=1000)
             start_time = time.time()
             
             # Status reporter
@@ -358,41 +378,7 @@ class StressTestApplication:
             # Start status reporter
             status_task = asyncio.create_task(report_status())
             
-            # Producer task
-            async def produce_updates():
-                def on_update(update: Update):
-                    asyncio.create_task(updates_queue.put(update))
-                    
-                await self.load_gen.generate_concurrent_load(
-                    user_ids=list(range(1, num_users + 1)),
-                    messages_per_user=messages_per_user,
-                    on_update=on_update
-                )
-                
-            # Consumer tasks
-            async def consume_updates():
-                while True:
-                    try:
-                        update = await asyncio.wait_for(updates_queue.get(), timeout=1.0)
-                        await self.process_update(update)
-                    except asyncio.TimeoutError:
-                        if updates_queue.empty() and time.time() - start_time > test_duration:
-                            break
-                    except Exception as e:
-                        logger.error(f"Error processing update: {e}")
-                        
-            # Start producer
-            producer = asyncio.create_task(produce_updates())
-            
-            # Start consumers
-            consumers = [
-                asyncio.create_task(consume_updates())
-                for _ in range(10)
-            ]
-            
-            # Wait for completion
-            await producer
-            await asyncio.gather(*consumers, return_exceptions=True)
+            await self._run_queued_load(num_users, messages_per_user)
             status_task.cancel()
             
         finally:
@@ -478,4 +464,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run_with_fast_loop(main())
\ No newline at end of file
@@ -7,6 +7,31 @@ from src.models.intent import TaskCreation, CommandExecution, Intent
 from src.models.task import TaskSchema
 
 
+_UPDATES = {"priority": 4, "due_string": "tomorrow", "labels": ["urgent", "work"]}
+
+_RAW_COMMANDS = {
+    "view_today_p3": {"command_type": "view_tasks", "target": "today", "filters": {"priority": 3}},
+    "delete_last": {"command_type": "delete_task", "target": "last"},
+    "update_last": {"command_type": "update_task", "target": "last", "updates": _UPDATES},
+    "complete_specific": {"command_type": "complete_task", "target": "specific", "task_identifier": "12345"},
+    "default_target": {"command_type": "delete_task"},
+}
+
+# Validated once at import; the field tests below only read from these
+_CMD_SAMPLES = {
+    sample_id: CommandExecution.model_validate({"type": "command", **raw})
+    for sample_id, raw in _RAW_COMMANDS.items()
+}
+
+_EXPECTED_FIELDS = {
+    "view_today_p3": {"command_type": "view_tasks", "target": "today", "filters": {"priority": 3}},
+    "delete_last": {"command_type": "delete_task", "target": "last", "filters": None, "updates": None},
+    "update_last": {"command_type": "update_task", "updates": _UPDATES},
+    "complete_specific": {"command_type": "complete_task", "target": "specific", "task_identifier": "12345"},
+    "default_target": {"target": "last"},
+}
+
+
 class TestTaskCreation:
     """Test TaskCreation model."""
 
@@ -45,92 +70,29 @@ class TestTaskCreation:
 class TestCommandExecution:
     """Test CommandExecution model."""
 
-    def test_view_tasks_command(self):
-        """Test creating view_tasks command."""
-        cmd = CommandExecution(
-            type="command",
-            command_type="view_tasks",
-            target="today",
-            filters={"priority": 3}
-        )
-        
-        assert cmd.type == "command"
-        assert cmd.command_type == "view_tasks"
-        assert cmd.target == "today"
-        assert cmd.filters == {"priority": 3}
+    @pytest.mark.parametrize("sample_id", list(_EXPECTED_FIELDS))
+    def test_command_fields(self, sample_id):
+        """Test CommandExecution keeps the given fields and defaults."""
+        cmd = _CMD_SAMPLES[sample_id]
 
-    def test_delete_task_command(self):
-        """Test creating delete_task command."""
-        cmd = CommandExecution(
-            type="command",
-            command_type="delete_task",
-            target="last"
-        )
-        
-        assert cmd.type == "command"
-        assert cmd.command_type == "delete_task"
-        assert cmd.target == "last"
-        assert cmd.filters is None
-        assert cmd.updates is None
-
-    def test_update_task_command(self):
-        """Test creating update_task command."""
-        cmd = CommandExecution(
-            type="command",
-            command_type="update_task",
-            target="last",
-            updates={
-                "priority": 4,
-                "due_string": "tomorrow",
-                "labels": ["urgent", "work"]
-            }
-        )
-        
         assert cmd.type == "command"
-        assert cmd.command_type == "update_task"
-        assert cmd.updates["priority"] == 4
-        assert cmd.updates["due_string"] == "tomorrow"
-        assert cmd.updates["labels"] == ["urgent", "work"]
-
-    def test_complete_task_command(self):
-        """Test creating complete_task command."""
-        cmd = CommandExecution(
-            type="command",
-            command_type="complete_task",
-            target="specific",
-            task_identifier="12345"
-        )
-        
-        assert cmd.type == "command"
-        assert cmd.command_type == "complete_task"
-        assert cmd.target == "specific"
-        assert cmd.task_identifier == "12345"
-
-    def test_default_target(self):
-        """Test default target value."""
-        cmd = CommandExecution(
-            type="command",
-            command_type="delete_task"
-        )
-        
-        assert cmd.target == "last"  # Default value
-
-    def test_invalid_command_type(self):
-        """Test invalid command_type."""
+        for name, value in _EXPECTED_FIELDS[sample_id].items():
+            assert getattr(cmd, name) == value
+
+    @pytest.mark.parametrize(
+        "raw",
+        [
+            pytest.param({"type": "command", "command_type": "invalid_command"}, id="invalid_command_type"),
+            pytest.param(
+                {"type": "command", "command_type": "view_tasks", "target": "invalid_target"},
+                id="invalid_target",
+            ),
+        ],
+    )
+    def test_invalid_command(self, raw):
+        """Test CommandExecution rejects unknown command types and targets."""
         with pytest.raises(ValidationError):
-            CommandExecution(
-                type="command",
-                command_type="invalid_command"
-            )
-
-    def test_invalid_target(self):
-        """Test invalid target."""
-        with pytest.raises(ValidationError):
-            CommandExecution(
-                type="command",
-                command_type="view_tasks",
-                target="invalid_target"
-            )
+            CommandExecution.__pydantic_validator__.validate_python(raw)
 
 
 class TestIntentUnion:
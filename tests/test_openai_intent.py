@@ -1,17 +1,45 @@
 """Tests for OpenAI intent parsing."""
 
 import pytest
+from tenacity import wait_none
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from src.core.settings import get_settings
 from src.models.intent import TaskCreation, CommandExecution, Intent
 from src.models.task import TaskSchema
 from src.services.openai_service import OpenAIService
 
+pytestmark = [pytest.mark.asyncio(loop_scope="module"), pytest.mark.timeout(5)]
+
+# Intents the mocked model returns, built once at import
+_INTENT_CREATE_MILK = TaskCreation(
+    type="create_task",
+    task=TaskSchema(content="Купить молоко", due_string="завтра", priority=1),
+)
+_INTENT_CREATE_CENSORED = TaskCreation(type="create_task", task=TaskSchema(content="Купить ****"))
+_INTENT_VIEW_TODAY = CommandExecution(type="command", command_type="view_tasks", target="today")
+_INTENT_VIEW_TOMORROW = CommandExecution(type="command", command_type="view_tasks", target="tomorrow")
+_INTENT_DELETE_LAST = CommandExecution(type="command", command_type="delete_task", target="last")
+_INTENT_UPDATE_LAST = CommandExecution(
+    type="command", command_type="update_task", target="last", updates={"priority": 4}
+)
+_INTENT_COMPLETE_LAST = CommandExecution(type="command", command_type="complete_task", target="last")
+
+# (message, intent the model returns) for each command type
+_COMMAND_CASES = [
+    ("Покажи задачи на сегодня", _INTENT_VIEW_TODAY),
+    ("Удали последнюю задачу", _INTENT_DELETE_LAST),
+    ("Сделай последнюю задачу срочной", _INTENT_UPDATE_LAST),
+    ("Отметь последнюю задачу выполненной", _INTENT_COMPLETE_LAST),
+]
+
 
 @pytest.fixture
-def openai_service():
-    """Create OpenAI service instance."""
-    return OpenAIService()
+def openai_service(monkeypatch):
+    """Create OpenAI service instance that gives up on the network quickly."""
+    monkeypatch.setattr(OpenAIService.parse_intent.retry, "wait", wait_none())
+    settings = get_settings().model_copy(update={"openai_timeout": 1})
+    return OpenAIService(settings=settings)
 
 
 @pytest.fixture
@@ -24,22 +52,10 @@ def mock_instructor_client():
 class TestParseIntent:
     """Test parse_intent method."""
 
-    @pytest.mark.asyncio
     async def test_parse_task_creation_intent(self, openai_service, mock_instructor_client):
         """Test parsing task creation intent."""
-        # Mock response
-        expected_task = TaskSchema(
-            content="Купить молоко",
-            due_string="завтра",
-            priority=1
-        )
-        expected_intent = TaskCreation(
-            type="create_task",
-            task=expected_task
-        )
-        
         # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
+        mock_create = AsyncMock(return_value=_INTENT_CREATE_MILK)
         openai_service.instructor_client.chat.completions.create = mock_create
         
         # Test
@@ -57,107 +73,27 @@ class TestParseIntent:
         assert call_args["response_model"] == Intent
         assert call_args["temperature"] == 0.2
 
-    @pytest.mark.asyncio
-    async def test_parse_view_command_intent(self, openai_service, mock_instructor_client):
-        """Test parsing view tasks command."""
-        # Mock response
-        expected_intent = CommandExecution(
-            type="command",
-            command_type="view_tasks",
-            target="today"
-        )
-        
-        # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
-        openai_service.instructor_client.chat.completions.create = mock_create
-        
-        # Test
-        result = await openai_service.parse_intent("Покажи задачи на сегодня")
-        
-        # Verify
-        assert isinstance(result, CommandExecution)
-        assert result.type == "command"
-        assert result.command_type == "view_tasks"
-        assert result.target == "today"
-
-    @pytest.mark.asyncio
-    async def test_parse_delete_command_intent(self, openai_service, mock_instructor_client):
-        """Test parsing delete task command."""
-        # Mock response
-        expected_intent = CommandExecution(
-            type="command",
-            command_type="delete_task",
-            target="last"
-        )
-        
-        # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
+    async def test_parse_command_intents(self, openai_service, mock_instructor_client):
+        """Test parsing view, delete, update and complete commands."""
+        # One mock answers every message in order
+        mock_create = AsyncMock(side_effect=[intent for _, intent in _COMMAND_CASES])
         openai_service.instructor_client.chat.completions.create = mock_create
-        
-        # Test
-        result = await openai_service.parse_intent("Удали последнюю задачу")
-        
-        # Verify
-        assert isinstance(result, CommandExecution)
-        assert result.command_type == "delete_task"
-        assert result.target == "last"
-
-    @pytest.mark.asyncio
-    async def test_parse_update_command_intent(self, openai_service, mock_instructor_client):
-        """Test parsing update task command."""
-        # Mock response
-        expected_intent = CommandExecution(
-            type="command",
-            command_type="update_task",
-            target="last",
-            updates={"priority": 4}
-        )
-        
-        # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
-        openai_service.instructor_client.chat.completions.create = mock_create
-        
-        # Test
-        result = await openai_service.parse_intent("Сделай последнюю задачу срочной")
-        
-        # Verify
-        assert isinstance(result, CommandExecution)
-        assert result.command_type == "update_task"
-        assert result.updates == {"priority": 4}
-
-    @pytest.mark.asyncio
-    async def test_parse_complete_command_intent(self, openai_service, mock_instructor_client):
-        """Test parsing complete task command."""
-        # Mock response
-        expected_intent = CommandExecution(
-            type="command",
-            command_type="complete_task",
-            target="last"
-        )
-        
-        # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
-        openai_service.instructor_client.chat.completions.create = mock_create
-        
-        # Test
-        result = await openai_service.parse_intent("Отметь последнюю задачу выполненной")
-        
-        # Verify
-        assert isinstance(result, CommandExecution)
-        assert result.command_type == "complete_task"
 
-    @pytest.mark.asyncio
+        for message, expected_intent in _COMMAND_CASES:
+            result = await openai_service.parse_intent(message)
+
+            assert isinstance(result, CommandExecution), message
+            assert result.type == "command"
+            assert result.command_type == expected_intent.command_type
+            assert result.target == expected_intent.target
+            assert result.updates == expected_intent.updates
+
+        assert mock_create.await_count == len(_COMMAND_CASES)
+
     async def test_parse_intent_english(self, openai_service, mock_instructor_client):
         """Test parsing intent in English."""
-        # Mock response
-        expected_intent = CommandExecution(
-            type="command",
-            command_type="view_tasks",
-            target="tomorrow"
-        )
-        
         # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
+        mock_create = AsyncMock(return_value=_INTENT_VIEW_TOMORROW)
         openai_service.instructor_client.chat.completions.create = mock_create
         
         # Test
@@ -173,7 +109,6 @@ class TestParseIntent:
         messages = call_args["messages"]
         assert "intelligent intent classifier" in messages[0]["content"]
 
-    @pytest.mark.asyncio
     async def test_parse_intent_short_message(self, openai_service):
         """Test parsing intent with too short message."""
         from src.core.exceptions import ValidationError
@@ -183,18 +118,10 @@ class TestParseIntent:
         
         assert "too short" in str(exc_info.value)
 
-    @pytest.mark.asyncio
     async def test_parse_intent_profanity_filter(self, openai_service, mock_instructor_client):
         """Test profanity filtering in intent parsing."""
-        # Mock response
-        expected_task = TaskSchema(content="Купить ****")
-        expected_intent = TaskCreation(
-            type="create_task",
-            task=expected_task
-        )
-        
         # Setup mock
-        mock_create = AsyncMock(return_value=expected_intent)
+        mock_create = AsyncMock(return_value=_INTENT_CREATE_CENSORED)
         openai_service.instructor_client.chat.completions.create = mock_create
         
         # Test with profanity
@@ -1,15 +1,20 @@
 """Simple stress test - 50 users sending messages simultaneously."""
 
 import asyncio
+import functools
+import itertools
+import os
 import random
 import time
 from datetime import datetime
 from typing import List
 from unittest.mock import AsyncMock, Mock, patch
 
+import numpy as np
 import pytest
+import pytest_asyncio
 from aiogram import Bot, Dispatcher
-from aiogram.types import Chat, Message, User, Voice
+from aiogram.types import Chat, Message, Update, User, Voice
 
 from src.core.database import get_database
 from src.core.redis_storage import RetryRedisStorage
@@ -24,10 +29,82 @@ from src.core.middleware import (
 )
 
 
+# Enough seeded users to support up to 100 concurrent users
+_SEED_USERS = 100
+
+# Upper bound on real Redis connections shared by the stress tests
+_REDIS_MAX_CONNECTIONS = 64
+
+_TEXTS: tuple[str, ...] = (
+    "Купить молоко завтра",
+    "Позвонить маме в 18:00",
+    "Встреча с клиентом в понедельник в 10:00",
+    "Оплатить счета до конца месяца",
+    "Записаться к врачу на следующей неделе",
+)
+
+# Handlers never look at the message date, so every fake message shares one
+_NOW = datetime.now()
+
+# Update ids only need to be unique within a run
+_UID_COUNTER = itertools.count(1)
+
+_NUM_USERS = 50
+
+# mode -> (messages per user, inter-message delay, time limit, max error ratio,
+#          P95 latency limit in seconds)
+_STRESS_MODES: dict[str, tuple[int, float, float | None, float, float | None]] = {
+    "sustained": (10, 0.0, 5, 0.1, 2.0),
+    # Realistic pacing: the test time is dominated by the sleeps
+    "paced": (10, 0.3, 120, 0.1, 2.0),
+    # Every user sends one message at exactly the same time
+    "burst": (1, 0.0, None, 0.2, None),
+}
+
+# xdist workers share one Postgres, so wall-clock limits only hold when run alone
+_UNDER_XDIST = "PYTEST_XDIST_WORKER" in os.environ
+
+# Opts in to stressing the pipeline without RateLimitMiddleware and LoggingMiddleware
+_SKIP_RATELIMIT_AND_LOGGING = bool(os.environ.get("STRESS_SKIP_RATELIMIT_AND_LOGGING"))
+
+
+@functools.lru_cache(maxsize=1)
+def _seed_tokens(session_secret: str) -> tuple[str, ...]:
+    """Encrypt the fake Todoist tokens once per session secret.
+
+    The secret is only the cache key: it is what EncryptionService derives
+    its Fernet key from, so a different secret needs fresh ciphertexts.
+    """
+    from src.services.encryption import EncryptionService
+
+    encryption = EncryptionService()
+    return tuple(
+        encryption.encrypt(f"fake_todoist_token_{user_id}")
+        for user_id in range(1, _SEED_USERS + 1)
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _redis_pool(redis_url: str):
+    """Build the connection pool shared by every StressTestBot in this run."""
+    from redis.asyncio import ConnectionPool
+
+    return ConnectionPool.from_url(
+        redis_url,
+        max_connections=_REDIS_MAX_CONNECTIONS,
+        decode_responses=True,
+    )
+
+
 class StressTestBot:
     """Helper class to create a test bot with real handlers."""
     
-    def __init__(self):
+    def __init__(self, skip_ratelimit_and_logging: bool | None = None):
+        # Throughput runs can leave out rate limiting and logging;
+        # STRESS_SKIP_RATELIMIT_AND_LOGGING sets the default
+        if skip_ratelimit_and_logging is None:
+            skip_ratelimit_and_logging = _SKIP_RATELIMIT_AND_LOGGING
+        self.skip_ratelimit_and_logging = skip_ratelimit_and_logging
         self.settings = get_settings()
         self.database = get_database()
         self.processed_messages = 0
@@ -47,12 +124,16 @@ class StressTestBot:
         self.bot.get_file = AsyncMock()
         self.bot.download_file = AsyncMock(return_value=b"fake audio data")
         
-        # Create real Redis connection for testing
-        from redis.asyncio import Redis
-        self.redis = Redis.from_url(
-            self.settings.redis_url,
-            decode_responses=True
-        )
+        # FSM storage runs on in-process fakeredis unless a real server is requested
+        if os.environ.get("STRESS_USE_REAL_REDIS"):
+            from redis.asyncio import Redis
+            self.redis = Redis(connection_pool=_redis_pool(self.settings.redis_url))
+        else:
+            from fakeredis import FakeAsyncRedis
+            self.redis = FakeAsyncRedis(decode_responses=True)
+        
+        # Keep in-flight updates within what the Redis pool can serve
+        self.feed_limit = asyncio.Semaphore(_REDIS_MAX_CONNECTIONS)
         
         # Create dispatcher with real storage
         self.dispatcher = Dispatcher(
@@ -66,12 +147,14 @@ class StressTestBot:
         self.dispatcher.include_router(message_router)
         self.dispatcher.include_router(callback_router)
         
-        # Disable rate limiting for stress test
-        self.dispatcher.message.middleware(RateLimitMiddleware(max_requests=1000, window=1))
+        if not self.skip_ratelimit_and_logging:
+            # Limit high enough that only the per-user bookkeeping is stressed
+            self.dispatcher.message.middleware(RateLimitMiddleware(max_requests=1000, window=1))
         self.dispatcher.message.middleware(UserContextMiddleware())
         self.dispatcher.message.middleware(AuthMiddleware())
         self.dispatcher.message.middleware(ErrorHandlingMiddleware())
-        self.dispatcher.message.middleware(LoggingMiddleware())
+        if not self.skip_ratelimit_and_logging:
+            self.dispatcher.message.middleware(LoggingMiddleware())
         
         # Initialize database
         await self.database.create_tables()
@@ -79,30 +162,47 @@ class StressTestBot:
         # Create test users in database
         await self._create_test_users()
         
+    async def feed(self, message: Message) -> None:
+        """Feed one message through the dispatcher, bounded by feed_limit.
+
+        The update is bound to the mock bot up front so feed_update does not
+        re-mount it with a dump/validate round-trip.
+        """
+        update = Update(update_id=next(_UID_COUNTER), message=message).as_(self.bot)
+        async with self.feed_limit:
+            await self.dispatcher.feed_update(self.bot, update)
+        
     async def _create_test_users(self):
         """Create test users in database with Todoist tokens."""
-        from src.repositories.user import UserRepository
-        from src.services.encryption import EncryptionService
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        from src.models.db import User
+        
+        tokens = _seed_tokens(self.settings.session_secret.get_secret_value())
         
-        encryption = EncryptionService()
+        # Upsert all users and their encrypted fake Todoist tokens in one statement
+        stmt = pg_insert(User).values([
+            {
+                "id": user_id,
+                "username": f"user{user_id}",
+                "first_name": f"User{user_id}",
+                "language_code": "ru",
+                "todoist_token_encrypted": tokens[user_id - 1],
+            }
+            for user_id in range(1, _SEED_USERS + 1)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "username": stmt.excluded.username,
+                "first_name": stmt.excluded.first_name,
+                "language_code": stmt.excluded.language_code,
+                "todoist_token_encrypted": stmt.excluded.todoist_token_encrypted,
+            },
+        )
         
         async with self.database.get_session() as session:
-            user_repo = UserRepository(session)
-            
-            # Create 100 test users (to support up to 100 concurrent users)
-            for user_id in range(1, 101):
-                # Create or update user
-                user = await user_repo.create_or_update(
-                    user_id=user_id,
-                    username=f"user{user_id}",
-                    first_name=f"User{user_id}",
-                    language_code="ru"
-                )
-                
-                # Encrypt and set a fake Todoist token
-                encrypted_token = encryption.encrypt(f"fake_todoist_token_{user_id}")
-                await user_repo.update_todoist_token(user_id, encrypted_token)
-            
+            await session.execute(stmt)
             await session.commit()
         
     async def cleanup(self):
@@ -111,8 +211,9 @@ class StressTestBot:
         await self.database.close()
 
 
-def create_fake_message(user_id: int, text: str = None, voice: bool = False) -> Message:
-    """Create a fake Telegram message for testing."""
+@functools.lru_cache(maxsize=128)
+def _user_chat(user_id: int) -> tuple[User, Chat]:
+    """Build the sender and private chat for a user once and reuse them."""
     user = User(
         id=user_id,
         is_bot=False,
@@ -127,6 +228,12 @@ def create_fake_message(user_id: int, text: str = None, voice: bool = False) ->
         first_name=f"User{user_id}",
         username=f"user{user_id}"
     )
+    return user, chat
+
+
+def create_fake_message(user_id: int, text: str = None, voice: bool = False) -> Message:
+    """Create a fake Telegram message for testing."""
+    user, chat = _user_chat(user_id)
     
     message_id = random.randint(1000, 99999)
     
@@ -139,7 +246,7 @@ def create_fake_message(user_id: int, text: str = None, voice: bool = False) ->
         )
         return Message(
             message_id=message_id,
-            date=datetime.now(),
+            date=_NOW,
             chat=chat,
             from_user=user,
             voice=voice_obj
@@ -148,72 +255,144 @@ def create_fake_message(user_id: int, text: str = None, voice: bool = False) ->
         # Create text message
         return Message(
             message_id=message_id,
-            date=datetime.now(),
+            date=_NOW,
             chat=chat,
             from_user=user,
             text=text or f"Тестовое сообщение от пользователя {user_id}"
         )
 
 
+async def _send_one(bot: StressTestBot, user_id: int, i: int, send_at: float) -> int:
+    """Send a user's i-th message send_at seconds from now and return its latency in ns."""
+    if send_at:
+        await asyncio.sleep(send_at)
+    
+    start = time.perf_counter_ns()
+    
+    # 70% text, 30% voice, in a fixed order so runs are comparable
+    if (i * 3) % 10 >= 3:
+        message = create_fake_message(user_id, text=_TEXTS[i % len(_TEXTS)])
+    else:
+        message = create_fake_message(user_id, voice=True)
+    
+    # Bind the mock bot so message.answer() and friends go through it;
+    # Message is frozen, so the methods themselves cannot be replaced
+    message.as_(bot.bot)
+    
+    # Process message through dispatcher
+    await bot.feed(message)
+    
+    return time.perf_counter_ns() - start
+
+
 async def simulate_user_activity(
     bot: StressTestBot,
     user_id: int,
-    messages_count: int = 10
+    messages_count: int = 10,
+    inter_delay: float = 0.0
 ) -> dict:
-    """Simulate one user sending multiple messages."""
+    """Simulate one user sending multiple messages.
+
+    All messages are in flight at once; with inter_delay > 0 the i-th one
+    is held back i * inter_delay seconds to keep the pacing schedule.
+    """
     results = {
         "user_id": user_id,
         "sent": 0,
         "errors": 0,
-        "timings": []
+        "timings": np.empty(messages_count, dtype=np.int64)
     }
     
-    # Mix of message types
-    for i in range(messages_count):
-        try:
-            start = time.time()
-            
-            # 70% text, 30% voice
-            if random.random() < 0.7:
-                message = create_fake_message(
-                    user_id,
-                    text=random.choice([
-                        "Купить молоко завтра",
-                        "Позвонить маме в 18:00",
-                        "Встреча с клиентом в понедельник в 10:00",
-                        "Оплатить счета до конца месяца",
-                        "Записаться к врачу на следующей неделе"
-                    ])
-                )
-            else:
-                message = create_fake_message(user_id, voice=True)
-            
-            # Attach answer method to message for handlers to use
-            message.answer = bot.bot.send_message
-            message.bot = bot.bot
-            
-            # Process message through dispatcher
-            update = {"message": message, "update_id": random.randint(1, 999999)}
-            await bot.dispatcher.feed_update(bot.bot, update)
-            
-            elapsed = time.time() - start
-            results["timings"].append(elapsed)
-            results["sent"] += 1
-            
-            # Small random delay between messages
-            await asyncio.sleep(random.uniform(0.1, 0.5))
-            
-        except Exception as e:
+    outcomes = await asyncio.gather(
+        *(_send_one(bot, user_id, i, i * inter_delay) for i in range(messages_count)),
+        return_exceptions=True
+    )
+    
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
             results["errors"] += 1
-            bot.errors.append(f"User {user_id}: {str(e)}")
+            bot.errors.append(f"User {user_id}: {str(outcome)}")
+        else:
+            results["timings"][results["sent"]] = outcome
+            results["sent"] += 1
     
+    results["timings"] = results["timings"][:results["sent"]]
     return results
 
 
-@pytest.mark.asyncio
-async def test_stress_50_concurrent_users():
-    """Test 50 users sending messages concurrently."""
-    print("\n=== STARTING STRESS TEST: 50 CONCURRENT USERS ===\n")
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def stress_bot():
+    """Set up one StressTestBot (Redis, tables, seeded users) for the module."""
+    bot = StressTestBot(skip_ratelimit_and_logging=False)
+    await bot.setup()
+    yield bot
+    await bot.cleanup()
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def reduced_stress_bot():
+    """Set up a StressTestBot without rate limiting and logging middleware."""
+    bot = StressTestBot(skip_ratelimit_and_logging=True)
+    await bot.setup()
+    yield bot
+    await bot.cleanup()
+
+
+async def _run_stress(mode: str, bot: StressTestBot) -> tuple[int, int, np.ndarray]:
+    """Drive one stress mode and return (sent, errors, latencies in ns)."""
+    messages_per_user, inter_delay, _, _, _ = _STRESS_MODES[mode]
+    
+    if mode == "burst":
+        # Create all messages first so only dispatching is timed
+        messages = [
+            create_fake_message(user_id, "Срочная задача!")
+            for user_id in range(1, _NUM_USERS + 1)
+        ]
+        for message in messages:
+            message.as_(bot.bot)
+        outcomes = await asyncio.gather(*(bot.feed(m) for m in messages), return_exceptions=True)
+        errors = [o for o in outcomes if isinstance(o, BaseException)]
+        bot.errors.extend(f"Burst: {error}" for error in errors)
+        return len(outcomes) - len(errors), len(errors), np.empty(0, dtype=np.int64)
+    
+    results = await asyncio.gather(
+        *(
+            simulate_user_activity(bot, user_id, messages_per_user, inter_delay)
+            for user_id in range(1, _NUM_USERS + 1)
+        ),
+        return_exceptions=True
+    )
+    
+    # Handle exceptions in results
+    exceptions = [r for r in results if isinstance(r, Exception)]
+    successful_results = [r for r in results if isinstance(r, dict)]
+    
+    if exceptions:
+        print(f"\n⚠️  {len(exceptions)} user simulations failed completely:")
+        for exc in exceptions[:5]:
+            print(f"  - {exc}")
+        if len(exceptions) > 5:
+            print(f"  ... and {len(exceptions) - 5} more")
+    
+    total_sent = sum(r["sent"] for r in successful_results)
+    total_errors = sum(r["errors"] for r in successful_results) + len(exceptions) * messages_per_user
+    timings = np.concatenate([r["timings"] for r in successful_results] or [np.empty(0, dtype=np.int64)])
+    return total_sent, total_errors, timings
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.parametrize(
+    "mode",
+    [
+        "sustained",
+        pytest.param("paced", marks=pytest.mark.slow),
+        "burst",
+    ],
+)
+async def test_stress_concurrent_users(stress_bot, mode):
+    """Test 50 users sending messages concurrently in the given mode."""
+    messages_per_user, _, time_limit, max_error_ratio, p95_limit = _STRESS_MODES[mode]
+    print(f"\n=== STARTING STRESS TEST ({mode}): {_NUM_USERS} CONCURRENT USERS ===\n")
     
     # Mock external services to avoid real API calls
     with patch('src.services.openai_service.OpenAIService.parse_intent') as mock_openai, \
@@ -225,6 +404,12 @@ async def test_stress_50_concurrent_users():
             intent_type="task_creation",
             task=Mock(content="Test task", project_name="Inbox")
         )
+        if mode == "burst":
+            async def delayed_parse(*args, **kwargs):
+                await asyncio.sleep(random.uniform(0.1, 0.3))  # Simulate API delay
+                return mock_openai.return_value
+            
+            mock_openai.side_effect = delayed_parse
         mock_deepgram.return_value = "Транскрибированный текст"
         mock_todoist.return_value = Mock(
             id="123",
@@ -232,153 +417,78 @@ async def test_stress_50_concurrent_users():
             project_id="456"
         )
         
-        # Create and setup test bot
-        bot = StressTestBot()
-        await bot.setup()
+        # Warm up routers, storage and model classes outside the timed section
+        warmup_start = time.time()
+        await simulate_user_activity(stress_bot, 1, 1)
+        print(f"Cold-start elapsed: {(time.time() - warmup_start) * 1000:.2f}ms")
         
-        try:
-            # Start timing
-            start_time = time.time()
-            
-            # Create tasks for 50 concurrent users
-            tasks = []
-            num_users = 50
-            messages_per_user = 10
-            
-            print(f"Creating {num_users} users, each sending {messages_per_user} messages...")
-            print(f"Total messages: {num_users * messages_per_user}\n")
-            
-            for user_id in range(1, num_users + 1):
-                task = simulate_user_activity(bot, user_id, messages_per_user)
-                tasks.append(task)
-            
-            # Run all users concurrently
-            print("Starting concurrent message sending...")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Calculate statistics
-            total_time = time.time() - start_time
-            
-            # Handle exceptions in results
-            exceptions = [r for r in results if isinstance(r, Exception)]
-            successful_results = [r for r in results if isinstance(r, dict)]
-            
-            if exceptions:
-                print(f"\n⚠️  {len(exceptions)} user simulations failed completely:")
-                for i, exc in enumerate(exceptions[:5]):
-                    print(f"  - {exc}")
-                if len(exceptions) > 5:
-                    print(f"  ... and {len(exceptions) - 5} more")
-            
-            total_sent = sum(r["sent"] for r in successful_results)
-            total_errors = sum(r["errors"] for r in successful_results) + len(exceptions) * messages_per_user
-            all_timings = []
-            
-            for r in successful_results:
-                if r["timings"]:
-                    all_timings.extend(r["timings"])
-            
-            # Print results
-            print("\n=== STRESS TEST RESULTS ===\n")
-            print(f"Total time: {total_time:.2f} seconds")
-            print(f"Total messages sent: {total_sent}")
-            print(f"Total errors: {total_errors}")
-            if total_sent > 0:
-                print(f"Success rate: {(total_sent - total_errors) / total_sent * 100:.1f}%")
-                print(f"Messages per second: {total_sent / total_time:.2f}")
-            else:
-                print("No messages were sent successfully!")
-            
-            if all_timings:
-                avg_time = sum(all_timings) / len(all_timings)
-                p95_time = sorted(all_timings)[int(len(all_timings) * 0.95)]
-                p99_time = sorted(all_timings)[int(len(all_timings) * 0.99)]
-                
-                print(f"\nLatency statistics:")
-                print(f"Average: {avg_time * 1000:.2f}ms")
-                print(f"P95: {p95_time * 1000:.2f}ms")
-                print(f"P99: {p99_time * 1000:.2f}ms")
-            
-            if bot.errors:
-                print(f"\nFirst 10 errors:")
-                for error in bot.errors[:10]:
-                    print(f"- {error}")
-            
-            # Assert basic success criteria
-            assert total_errors < total_sent * 0.1, f"Too many errors: {total_errors}/{total_sent}"
-            assert total_time < 120, f"Test took too long: {total_time}s"
-            
-            print("\n✅ STRESS TEST PASSED!")
-            
-        finally:
-            await bot.cleanup()
-
-
-@pytest.mark.asyncio 
-async def test_stress_burst_traffic():
-    """Test burst traffic - all users send messages at exactly the same time."""
-    print("\n=== STARTING BURST TEST: 50 USERS SIMULTANEOUS ===\n")
-    
-    with patch('src.services.openai_service.OpenAIService.parse_intent') as mock_openai, \
-         patch('src.services.deepgram_service.DeepgramService.transcribe') as mock_deepgram, \
-         patch('src.services.todoist_service.TodoistService.create_task') as mock_todoist:
+        # The bot is shared across modes, so only report this run's errors
+        stress_bot.errors.clear()
         
-        # Setup mocks with delays to simulate real processing
-        async def delayed_parse(*args, **kwargs):
-            await asyncio.sleep(random.uniform(0.1, 0.3))  # Simulate API delay
-            return Mock(
-                intent_type="task_creation",
-                task=Mock(content="Test task", project_name="Inbox")
-            )
+        print(f"Creating {_NUM_USERS} users, each sending {messages_per_user} messages...")
+        print(f"Total messages: {_NUM_USERS * messages_per_user}\n")
         
-        mock_openai.side_effect = delayed_parse
-        mock_deepgram.return_value = "Транскрибированный текст"
-        mock_todoist.return_value = Mock(id="123", content="Test task")
+        # Start timing
+        start_time = time.time()
+        total_sent, total_errors, timings = await _run_stress(mode, stress_bot)
+        total_time = time.time() - start_time
         
-        bot = StressTestBot()
-        await bot.setup()
+        # Print results
+        print("\n=== STRESS TEST RESULTS ===\n")
+        print(f"Total time: {total_time:.2f} seconds")
+        print(f"Total messages sent: {total_sent}")
+        print(f"Total errors: {total_errors}")
+        if total_sent > 0:
+            print(f"Success rate: {(total_sent - total_errors) / total_sent * 100:.1f}%")
+            print(f"Steady-state throughput: {total_sent / total_time:.2f} msg/s")
+        else:
+            print("No messages were sent successfully!")
         
-        try:
-            num_users = 50
-            
-            # Create all messages first
-            messages = []
-            for user_id in range(1, num_users + 1):
-                msg = create_fake_message(user_id, "Срочная задача!")
-                messages.append((user_id, msg))
-            
-            print(f"Sending {num_users} messages simultaneously...")
-            start_time = time.time()
-            
-            # Send all messages at once
-            tasks = []
-            for user_id, msg in messages:
-                task = bot.dispatcher.feed_update(bot.bot, {"message": msg})
-                tasks.append(task)
-            
-            # Wait for all to complete
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            total_time = time.time() - start_time
-            errors = [r for r in results if isinstance(r, Exception)]
-            
-            print(f"\nBurst test completed in {total_time:.2f}s")
-            print(f"Successful: {len(results) - len(errors)}")
-            print(f"Errors: {len(errors)}")
-            print(f"Processing rate: {len(results) / total_time:.2f} msg/s")
-            
-            if errors:
-                print(f"\nFirst 5 errors:")
-                for error in errors[:5]:
-                    print(f"- {error}")
-            
-            assert len(errors) < len(results) * 0.2, "Too many errors in burst test"
-            
-        finally:
-            await bot.cleanup()
+        if timings.size:
+            avg_ms = timings.mean() / 1e6
+            p95_ms, p99_ms = np.percentile(timings, [95, 99]) / 1e6
+            
+            print(f"\nLatency statistics:")
+            print(f"Average: {avg_ms:.2f}ms")
+            print(f"P95: {p95_ms:.2f}ms")
+            print(f"P99: {p99_ms:.2f}ms")
+        
+        if stress_bot.errors:
+            print(f"\nFirst 10 errors:")
+            for error in stress_bot.errors[:10]:
+                print(f"- {error}")
+        
+        # Assert basic success criteria
+        assert total_errors < total_sent * max_error_ratio, f"Too many errors: {total_errors}/{total_sent}"
+        if p95_limit is not None and timings.size:
+            assert p95_ms < p95_limit * 1000, f"P95 latency too high: {p95_ms:.2f}ms"
+        if time_limit is not None and not _UNDER_XDIST:
+            assert total_time < time_limit, f"Test took too long: {total_time}s"
+        
+        print("\n✅ STRESS TEST PASSED!")
+
+
+@pytest.mark.asyncio(loop_scope="module")
+@pytest.mark.skipif(
+    not _SKIP_RATELIMIT_AND_LOGGING,
+    reason="set STRESS_SKIP_RATELIMIT_AND_LOGGING=1 to stress the reduced pipeline",
+)
+async def test_stress_reduced_pipeline(reduced_stress_bot):
+    """Test sustained load without rate limiting and logging middleware."""
+    await test_stress_concurrent_users(reduced_stress_bot, "sustained")
+
+
+async def _run_directly() -> None:
+    """Run the sustained and burst stress tests against one bot outside pytest."""
+    stress_bot = StressTestBot()
+    await stress_bot.setup()
+    try:
+        for mode in ("sustained", "burst"):
+            await test_stress_concurrent_users(stress_bot, mode)
+    finally:
+        await stress_bot.cleanup()
 
 
 if __name__ == "__main__":
     # Run tests directly
-    asyncio.run(test_stress_50_concurrent_users())
-    asyncio.run(test_stress_burst_traffic())
\ No newline at end of file
+    asyncio.run(_run_directly())
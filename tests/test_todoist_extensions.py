@@ -1,12 +1,16 @@
 """Tests for Todoist service extensions."""
 
+from typing import Any
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+import pytest_asyncio
 import httpx
 
-from src.services.todoist_service import TodoistService
+from src.services.todoist_service import TODOIST_API_URL, TodoistService
 from src.core.exceptions import TodoistError, InvalidTokenError
 
+pytestmark = pytest.mark.asyncio(loop_scope="module")
+
 
 @pytest.fixture
 def todoist_service():
@@ -14,92 +18,95 @@ def todoist_service():
     return TodoistService(api_token="test_token")
 
 
-@pytest.fixture
-def mock_http_client(monkeypatch):
-    """Mock httpx.AsyncClient."""
-    mock_client = AsyncMock()
-    mock_response = MagicMock()  # Use MagicMock for response to avoid async issues
-    
-    # Setup default successful response
-    mock_response.status_code = 200
-    mock_response.json.return_value = []
-    mock_response.content = b'[]'
-    mock_response.headers = {}
-    
-    # Make get and post return the mock response
-    mock_client.get = AsyncMock(return_value=mock_response)
-    mock_client.post = AsyncMock(return_value=mock_response)
-    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-    mock_client.__aexit__ = AsyncMock(return_value=None)
-    
-    # Mock the client creation
-    def mock_get_client(self):
-        return mock_client
-    
-    monkeypatch.setattr(TodoistService, "_get_client", mock_get_client)
+class _FakeTodoistAPI:
+    """MockTransport handler that records requests and serves one canned response."""
+
+    def __init__(self) -> None:
+        self.requests: list[httpx.Request] = []
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget recorded requests and restore the default successful response."""
+        self.requests.clear()
+        self.status_code = 200
+        self.json: Any = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Record the request and answer with the configured status and JSON."""
+        self.requests.append(request)
+        if self.json is None:
+            return httpx.Response(self.status_code)
+        return httpx.Response(self.status_code, json=self.json)
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="module")
+async def fake_api():
+    """Serve TodoistService's shared client from an in-process MockTransport."""
+    api = _FakeTodoistAPI()
+    transport = httpx.MockTransport(api.handle)
     
-    return mock_client, mock_response
+    # monkeypatch is function-scoped, so patch through a context instead
+    async with httpx.AsyncClient(base_url=TODOIST_API_URL, transport=transport) as client:
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(TodoistService, "_get_client", lambda self: client)
+            yield api
+
+
+@pytest.fixture(autouse=True)
+def _reset_fake_api(fake_api):
+    """Give every test an empty request log and the default response."""
+    fake_api.reset()
 
 
 class TestGetTasks:
     """Test get_tasks method."""
 
-    @pytest.mark.asyncio
-    async def test_get_tasks_no_filter(self, todoist_service, mock_http_client):
+    async def test_get_tasks_no_filter(self, todoist_service, fake_api):
         """Test getting tasks without filter."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock response data
         test_tasks = [
             {"id": "1", "content": "Task 1", "created_at": "2024-01-02T00:00:00Z"},
             {"id": "2", "content": "Task 2", "created_at": "2024-01-01T00:00:00Z"},
         ]
-        mock_response.json.return_value = test_tasks
+        fake_api.json = test_tasks
         
         # Test
         tasks = await todoist_service.get_tasks()
         
         # Verify API call
-        mock_client.get.assert_called_once_with(
-            "https://api.todoist.com/rest/v2/tasks",
-            headers=todoist_service.headers,
-            params={}
-        )
+        (request,) = fake_api.requests
+        assert request.method == "GET"
+        assert request.url.path == "/rest/v2/tasks"
+        assert request.headers["Authorization"] == todoist_service.headers["Authorization"]
+        assert not request.url.params
         
         # Verify sorting (newest first)
         assert len(tasks) == 2
         assert tasks[0]["id"] == "1"  # Newer task first
 
-    @pytest.mark.asyncio
-    async def test_get_tasks_with_today_filter(self, todoist_service, mock_http_client):
+    async def test_get_tasks_with_today_filter(self, todoist_service, fake_api):
         """Test getting tasks with 'today' filter."""
-        mock_client, mock_response = mock_http_client
-        
         test_tasks = [{"id": "1", "content": "Today's task"}]
-        mock_response.json.return_value = test_tasks
+        fake_api.json = test_tasks
         
         # Test
         tasks = await todoist_service.get_tasks(filter_string="today")
         
         # Verify API call with filter
-        mock_client.get.assert_called_once()
-        call_args = mock_client.get.call_args
-        assert call_args[1]["params"]["filter"] == "today"
+        (request,) = fake_api.requests
+        assert request.url.params["filter"] == "today"
         
         assert len(tasks) == 1
 
-    @pytest.mark.asyncio
-    async def test_get_tasks_with_priority_filter(self, todoist_service, mock_http_client):
+    async def test_get_tasks_with_priority_filter(self, todoist_service, fake_api):
         """Test getting tasks with priority filter."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock response with mixed priorities
         test_tasks = [
             {"id": "1", "content": "High priority", "priority": 3},
             {"id": "2", "content": "Normal priority", "priority": 1},
             {"id": "3", "content": "Also high", "priority": 3},
         ]
-        mock_response.json.return_value = test_tasks
+        fake_api.json = test_tasks
         
         # Test
         tasks = await todoist_service.get_tasks(filter_string="p3")
@@ -108,29 +115,23 @@ class TestGetTasks:
         assert len(tasks) == 2
         assert all(t["priority"] == 3 for t in tasks)
 
-    @pytest.mark.asyncio
-    async def test_get_tasks_with_project_filter(self, todoist_service, mock_http_client):
+    async def test_get_tasks_with_project_filter(self, todoist_service, fake_api):
         """Test getting tasks filtered by project."""
-        mock_client, mock_response = mock_http_client
-        
         test_tasks = [{"id": "1", "content": "Project task"}]
-        mock_response.json.return_value = test_tasks
+        fake_api.json = test_tasks
         
         # Test
         tasks = await todoist_service.get_tasks(project_id="project123")
         
         # Verify API call with project_id
-        call_args = mock_client.get.call_args
-        assert call_args[1]["params"]["project_id"] == "project123"
+        (request,) = fake_api.requests
+        assert request.url.params["project_id"] == "project123"
 
-    @pytest.mark.asyncio
-    async def test_get_tasks_with_limit(self, todoist_service, mock_http_client):
+    async def test_get_tasks_with_limit(self, todoist_service, fake_api):
         """Test limiting number of returned tasks."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock many tasks
         test_tasks = [{"id": str(i), "content": f"Task {i}"} for i in range(50)]
-        mock_response.json.return_value = test_tasks
+        fake_api.json = test_tasks
         
         # Test
         tasks = await todoist_service.get_tasks(limit=5)
@@ -138,13 +139,10 @@ class TestGetTasks:
         # Verify limit applied
         assert len(tasks) == 5
 
-    @pytest.mark.asyncio
-    async def test_get_tasks_error_handling(self, todoist_service, mock_http_client):
+    async def test_get_tasks_error_handling(self, todoist_service, fake_api):
         """Test error handling in get_tasks."""
-        mock_client, mock_response = mock_http_client
-        
         # Test 401 error
-        mock_response.status_code = 401
+        fake_api.status_code = 401
         with pytest.raises(InvalidTokenError):
             await todoist_service.get_tasks()
 
@@ -152,18 +150,15 @@ class TestGetTasks:
 class TestGetRecentTasks:
     """Test get_recent_tasks method."""
 
-    @pytest.mark.asyncio
-    async def test_get_recent_tasks(self, todoist_service, mock_http_client):
+    async def test_get_recent_tasks(self, todoist_service, fake_api):
         """Test getting recent tasks."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock response data
         test_tasks = [
             {"id": "1", "content": "Newest", "created_at": "2024-01-03T00:00:00Z"},
             {"id": "2", "content": "Middle", "created_at": "2024-01-02T00:00:00Z"},
             {"id": "3", "content": "Oldest", "created_at": "2024-01-01T00:00:00Z"},
         ]
-        mock_response.json.return_value = test_tasks
+        fake_api.json = test_tasks
         
         # Test
         tasks = await todoist_service.get_recent_tasks(limit=2)
@@ -177,47 +172,38 @@ class TestGetRecentTasks:
 class TestReopenTask:
     """Test reopen_task method."""
 
-    @pytest.mark.asyncio
-    async def test_reopen_task_success(self, todoist_service, mock_http_client):
+    async def test_reopen_task_success(self, todoist_service, fake_api):
         """Test successfully reopening a task."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock successful response (204 No Content)
-        mock_response.status_code = 204
+        fake_api.status_code = 204
+        fake_api.json = None
         
         # Test
         result = await todoist_service.reopen_task("task123")
         
         # Verify API call
-        mock_client.post.assert_called_once_with(
-            "https://api.todoist.com/rest/v2/tasks/task123/reopen",
-            headers=todoist_service.headers
-        )
+        (request,) = fake_api.requests
+        assert request.method == "POST"
+        assert request.url.path == "/rest/v2/tasks/task123/reopen"
+        assert request.headers["Authorization"] == todoist_service.headers["Authorization"]
         
         assert result is True
 
-    @pytest.mark.asyncio
-    async def test_reopen_task_not_found(self, todoist_service, mock_http_client):
+    async def test_reopen_task_not_found(self, todoist_service, fake_api):
         """Test reopening non-existent task."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock 404 response
-        mock_response.status_code = 404
+        fake_api.status_code = 404
         
         # Test
         result = await todoist_service.reopen_task("nonexistent")
         
         assert result is False
 
-    @pytest.mark.asyncio
-    async def test_reopen_task_error(self, todoist_service, mock_http_client):
+    async def test_reopen_task_error(self, todoist_service, fake_api):
         """Test error handling in reopen_task."""
-        mock_client, mock_response = mock_http_client
-        
         # Mock server error
-        mock_response.status_code = 500
-        mock_response.content = b'{"error": "Server error"}'
-        mock_response.json.return_value = {"error": "Server error"}
+        fake_api.status_code = 500
+        fake_api.json = {"error": "Server error"}
         
         # Test
         with pytest.raises(TodoistError) as exc_info: